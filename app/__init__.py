@@ -24,12 +24,16 @@ def create_app():
         app.logger.setLevel(logging.INFO)
         app.logger.info('Blockchain application startup')
 
+    from app import state
     from app.routes import main
     from app.api import api
 
     app.register_blueprint(main)
     app.register_blueprint(api)
 
+    app.extensions['blockchain'] = state.blockchain
+    state.blockchain.start_background_validation()
+
     if not os.path.exists('data'):
         os.makedirs('data')
 
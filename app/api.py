@@ -1,32 +1,45 @@
 import logging
 import uuid
-from flask import Blueprint, jsonify, request
-from blockchain.blockchain import Blockchain
+from flask import Blueprint, Response, jsonify, request
 from blockchain.transaction import Transaction
 from blockchain.merkle import MerkleTree
-from blockchain.signature import KeyManager
-from blockchain.network import PeerNetwork
+from app.state import blockchain, key_manager, peer_network
+from app.jsonutil import ojsonify, dumps
 
 logger = logging.getLogger(__name__)
 
 api = Blueprint('api', __name__, url_prefix='/api')
 
-blockchain = Blockchain()
-key_manager = KeyManager()
-peer_network = PeerNetwork()
-
 
 @api.route('/chain', methods=['GET'])
 def get_chain():
-    """Get the entire blockchain."""
+    """Get the entire blockchain, streamed block by block.
+
+    Supports conditional GETs: unchanged chains answer 304 with no body.
+    """
     try:
-        return jsonify({
-            'success': True,
-            'blockchain': blockchain.get_chain_as_dict(),
-            'stats': blockchain.get_stats()
-        })
+        etag = blockchain.chain_etag
+
+        if request.headers.get('If-None-Match') == etag:
+            return Response(status=304)
+
+        chain = blockchain.chain
+        stats = blockchain.get_stats()
+
+        def stream_chain():
+            yield b'{"success":true,"blockchain":['
+            for i, block in enumerate(chain):
+                if i:
+                    yield b','
+                yield dumps(block.to_dict())
+            yield b'],"stats":' + dumps(stats) + b'}'
+
+        response = Response(stream_chain(), mimetype='application/json',
+                            direct_passthrough=True)
+        response.headers['ETag'] = etag
+        return response
     except Exception as e:
-        logger.error(f"Error getting chain: {e}")
+        logger.error("Error getting chain: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -42,16 +55,16 @@ def get_block(index):
                 'error': f'Block {index} not found'
             }), 404
 
-        merkle_tree = MerkleTree(block.transactions)
+        include_tree = request.args.get('include_tree', '').lower() == 'true'
 
         return jsonify({
             'success': True,
             'block': block.to_dict(),
-            'merkle_tree': merkle_tree.to_dict()
+            'merkle_tree': block.merkle_tree.to_dict(include_tree=include_tree)
         })
 
     except Exception as e:
-        logger.error(f"Error getting block {index}: {e}")
+        logger.error("Error getting block %s: %s", index, e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -99,7 +112,67 @@ def create_transaction():
             }), 500
 
     except Exception as e:
-        logger.error(f"Error creating transaction: {e}")
+        logger.error("Error creating transaction: %s", e)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@api.route('/transactions/batch', methods=['POST'])
+def create_transactions_batch():
+    """Create and add a batch of transactions to the mempool."""
+    try:
+        data = request.json
+
+        if not data or not data.get('transactions'):
+            return jsonify({
+                'success': False,
+                'error': 'No transactions provided'
+            }), 400
+
+        entries = data['transactions']
+        parsed = []
+        results = [None] * len(entries)
+
+        for i, entry in enumerate(entries):
+            sender = entry.get('sender')
+            recipient = entry.get('recipient')
+            amount = entry.get('amount')
+
+            if not all([sender, recipient, amount]):
+                results[i] = {
+                    'success': False,
+                    'error': 'Missing required fields: sender, recipient, amount'
+                }
+                continue
+
+            try:
+                parsed.append((i, Transaction(
+                    sender=sender,
+                    recipient=recipient,
+                    amount=float(amount),
+                    fee=float(entry.get('fee', 0.0))
+                )))
+            except (TypeError, ValueError) as e:
+                results[i] = {'success': False, 'error': str(e)}
+
+        added = blockchain.transaction_pool.add_transactions(
+            [tx for _, tx in parsed]
+        )
+
+        for (i, tx), ok in zip(parsed, added):
+            if ok:
+                results[i] = {'success': True, 'transaction': tx.to_dict()}
+            else:
+                results[i] = {'success': False, 'error': 'Failed to add transaction to mempool'}
+
+        return jsonify({
+            'success': True,
+            'results': results,
+            'added': sum(1 for r in results if r['success']),
+            'mempool_size': blockchain.transaction_pool.size()
+        })
+
+    except Exception as e:
+        logger.error("Error creating transaction batch: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -126,9 +199,9 @@ def start_mining():
 
         def mining_callback(success, block, error):
             if success:
-                logger.info(f"Mining job {job_id} completed successfully")
+                logger.info("Mining job %s completed successfully", job_id)
             else:
-                logger.error(f"Mining job {job_id} failed: {error}")
+                logger.error("Mining job %s failed: %s", job_id, error)
 
         blockchain.miner.mine_block_async(
             index=len(blockchain.chain),
@@ -145,7 +218,7 @@ def start_mining():
         })
 
     except Exception as e:
-        logger.error(f"Error starting mining: {e}")
+        logger.error("Error starting mining: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -167,10 +240,40 @@ def get_mining_status(job_id):
         })
 
     except Exception as e:
-        logger.error(f"Error getting mining status: {e}")
+        logger.error("Error getting mining status: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@api.route('/mine/status/<job_id>/stream', methods=['GET'])
+def stream_mining_status(job_id):
+    """Stream mining job status as server-sent events.
+
+    Replaces tight polling of /mine/status/<job_id>: one connection gets
+    an event per status change until the job completes or is cancelled.
+    """
+    job = blockchain.miner.get_job(job_id)
+
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+
+    def event_stream():
+        while True:
+            job.update_event.wait(timeout=1.0)
+            job.update_event.clear()
+
+            status = job.get_status()
+            yield b'data: ' + dumps(status) + b'\n\n'
+
+            if status['is_complete'] or status['is_cancelled']:
+                break
+
+    return Response(event_stream(), mimetype='text/event-stream',
+                    direct_passthrough=True)
+
+
 @api.route('/mine/cancel/<job_id>', methods=['POST'])
 def cancel_mining(job_id):
     """Cancel a mining job."""
@@ -187,7 +290,7 @@ def cancel_mining(job_id):
             }), 404
 
     except Exception as e:
-        logger.error(f"Error cancelling mining: {e}")
+        logger.error("Error cancelling mining: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -222,7 +325,7 @@ def verify_tx_proof():
         })
 
     except Exception as e:
-        logger.error(f"Error verifying proof: {e}")
+        logger.error("Error verifying proof: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -230,12 +333,12 @@ def verify_tx_proof():
 def get_mempool():
     """Get current mempool status."""
     try:
-        return jsonify({
+        return ojsonify({
             'success': True,
             'mempool': blockchain.transaction_pool.to_dict()
         })
     except Exception as e:
-        logger.error(f"Error getting mempool: {e}")
+        logger.error("Error getting mempool: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -248,7 +351,7 @@ def get_peers():
             'peers': [peer.to_dict() for peer in peer_network.get_peers()]
         })
     except Exception as e:
-        logger.error(f"Error getting peers: {e}")
+        logger.error("Error getting peers: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -282,7 +385,7 @@ def add_peer():
         })
 
     except Exception as e:
-        logger.error(f"Error adding peer: {e}")
+        logger.error("Error adding peer: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -327,7 +430,7 @@ def sync_from_peer():
             }), 500
 
     except Exception as e:
-        logger.error(f"Error syncing from peer: {e}")
+        logger.error("Error syncing from peer: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -351,7 +454,7 @@ def create_key():
         })
 
     except Exception as e:
-        logger.error(f"Error creating key: {e}")
+        logger.error("Error creating key: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -359,15 +462,14 @@ def create_key():
 def list_keys():
     """List all keys."""
     try:
-        keys = []
-        for name in key_manager.list_keys():
-            key_pair = key_manager.get_key(name)
-            if key_pair:
-                keys.append({
-                    'name': name,
-                    'address': key_pair.address,
-                    'public_key': key_pair.public_key
-                })
+        keys = [
+            {
+                'name': name,
+                'address': key_pair.address,
+                'public_key': key_pair.public_key
+            }
+            for name, key_pair in key_manager.items()
+        ]
 
         return jsonify({
             'success': True,
@@ -375,7 +477,7 @@ def list_keys():
         })
 
     except Exception as e:
-        logger.error(f"Error listing keys: {e}")
+        logger.error("Error listing keys: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -399,7 +501,7 @@ def get_persistence_status():
             })
 
     except Exception as e:
-        logger.error(f"Error getting persistence status: {e}")
+        logger.error("Error getting persistence status: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
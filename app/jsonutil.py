@@ -0,0 +1,31 @@
+import json
+import logging
+from flask import Response, jsonify
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def dumps(payload) -> bytes:
+    """Serialize a payload to JSON bytes, with orjson when available."""
+    if orjson is None:
+        return json.dumps(payload).encode()
+    return orjson.dumps(payload)
+
+
+def ojsonify(payload, status: int = 200) -> Response:
+    """
+    Drop-in for jsonify on large responses, serializing with orjson
+    (a C extension, several times faster than stdlib json) when it is
+    installed. Falls back to Flask's jsonify otherwise.
+    """
+    if orjson is None:
+        response = jsonify(payload)
+        response.status_code = status
+        return response
+
+    return Response(orjson.dumps(payload), status=status, mimetype='application/json')
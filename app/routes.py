@@ -1,11 +1,10 @@
 import logging
-from flask import Blueprint, render_template, request, redirect, url_for, jsonify, flash
-from blockchain.blockchain import Blockchain
+from flask import Blueprint, Response, render_template, request, redirect, url_for, jsonify, flash
+from app.state import blockchain
+from app.jsonutil import ojsonify
 
 logger = logging.getLogger(__name__)
 
-blockchain = Blockchain()
-
 main = Blueprint("main", __name__)
 
 @main.route("/")
@@ -40,7 +39,7 @@ def add_block():
 @main.route("/validate")
 def validate():
     try:
-        is_valid, invalid_blocks = blockchain.is_chain_valid()
+        is_valid, invalid_blocks = blockchain.is_chain_valid(full=True)
         if is_valid:
             flash("Blockchain is valid!", "success")
         else:
@@ -54,11 +53,18 @@ def validate():
 @main.route("/api/blockchain")
 def api_blockchain():
     try:
-        return jsonify({
+        etag = blockchain.chain_etag
+
+        if request.headers.get('If-None-Match') == etag:
+            return Response(status=304)
+
+        response = ojsonify({
             'success': True,
             'blockchain': blockchain.get_chain_as_dict(),
             'stats': blockchain.get_stats()
         })
+        response.headers['ETag'] = etag
+        return response
     except Exception as e:
         logger.error(f"API error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -85,7 +91,7 @@ def api_add_block():
 @main.route("/api/validate")
 def api_validate():
     try:
-        is_valid, invalid_blocks = blockchain.is_chain_valid()
+        is_valid, invalid_blocks = blockchain.is_chain_valid(full=True)
         return jsonify({
             'success': True,
             'is_valid': is_valid,
@@ -0,0 +1,13 @@
+import logging
+from blockchain.blockchain import Blockchain
+from blockchain.signature import KeyManager
+from blockchain.network import PeerNetwork
+
+logger = logging.getLogger(__name__)
+
+# Single shared instances for the whole process. Both blueprints import
+# these so the web UI and the JSON API always see the same chain, mempool,
+# keys, and peer list.
+blockchain = Blockchain()
+key_manager = KeyManager()
+peer_network = PeerNetwork()
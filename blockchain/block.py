@@ -1,18 +1,25 @@
-import hashlib
+from __future__ import annotations
+
+import struct
 import time
 import logging
 from datetime import datetime
 from typing import Optional, List, Dict
 from dataclasses import dataclass, field
+from blockchain.merkle import MerkleTree
+from blockchain.utils import sha256 as _sha256
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class BlockHeader:
     """
     Block header containing metadata and links.
     Hash is computed only from the header.
+
+    slots=True keeps these high-count instances dict-free; the header
+    stays mutable because mining rewrites the nonce in place.
     """
     index: int
     timestamp: float
@@ -20,14 +27,117 @@ class BlockHeader:
     merkle_root: str
     nonce: int = 0
     difficulty: int = 0
+    _cached_hash: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _cached_digest: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    _prefix_ctx: Optional[object] = field(default=None, init=False, repr=False, compare=False)
+    _packed_prefix: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    # Packed layout of the hash preimage prefix: index, timestamp,
+    # previous hash (32 raw bytes), merkle root (32 raw bytes), difficulty,
+    # zero-padded to 128 bytes (a SHA-256 block boundary) so the cached
+    # pre-absorbed context holds two fully compressed blocks. Appending
+    # the 8-byte little-endian nonce per attempt then costs exactly one
+    # compression (nonce + SHA padding fit in a single 64-byte block).
+    PREFIX_PACK_FORMAT = '<Qd32s32sI44x'
+
+    # Fields that feed the pre-absorbed hash prefix; the nonce is
+    # appended per attempt and does not invalidate it.
+    _PREFIX_FIELDS = ('index', 'timestamp', 'previous_hash', 'merkle_root', 'difficulty')
+
+    _CACHE_SLOTS = ('_cached_hash', '_cached_digest', '_prefix_ctx', '_packed_prefix')
+
+    def __setattr__(self, name, value):
+        # Headers are effectively immutable once mined; the only field that
+        # changes in practice is the nonce during mining. Invalidate the
+        # cached hash whenever any header field is reassigned, and the
+        # cached prefix bytes/context only when a prefix field changes.
+        if name not in self._CACHE_SLOTS:
+            object.__setattr__(self, '_cached_hash', None)
+            object.__setattr__(self, '_cached_digest', None)
+            if name in self._PREFIX_FIELDS:
+                object.__setattr__(self, '_prefix_ctx', None)
+                object.__setattr__(self, '_packed_prefix', None)
+        object.__setattr__(self, name, value)
+
+    @staticmethod
+    def _hash_field_bytes(value: str) -> bytes:
+        """Pack a hash field into 32 raw bytes.
+
+        Canonical 64-char hex values are decoded; legacy placeholders like
+        "0" or "" are zero-padded so packing never fails.
+        """
+        if len(value) == 64:
+            try:
+                return bytes.fromhex(value)
+            except ValueError:
+                pass
+        return value.encode().ljust(32, b'\0')[:32]
+
+    def packed_prefix(self) -> bytes:
+        """Pack the constant header fields into a fixed binary prefix (cached).
+
+        Validation calls to_bytes() once per block per walk; caching the
+        packed bytes alongside the pre-absorbed context means repacking
+        only happens when a prefix field actually changes.
+        """
+        cached = getattr(self, '_packed_prefix', None)
+        if cached is None:
+            cached = struct.pack(
+                self.PREFIX_PACK_FORMAT,
+                self.index,
+                self.timestamp,
+                self._hash_field_bytes(self.previous_hash),
+                self._hash_field_bytes(self.merkle_root),
+                self.difficulty
+            )
+            self._packed_prefix = cached
+        return cached
+
+    def to_bytes(self) -> bytes:
+        """Full binary serialization of the header (prefix + nonce)."""
+        return self.packed_prefix() + self.nonce.to_bytes(8, 'little')
+
+    def prefix_context(self):
+        """SHA-256 context pre-absorbed with the packed prefix (cached)."""
+        ctx = getattr(self, '_prefix_ctx', None)
+        if ctx is None:
+            ctx = _sha256(self.packed_prefix())
+            self._prefix_ctx = ctx
+        return ctx
+
+    @property
+    def previous_hash_bytes(self) -> bytes:
+        """Previous block hash as 32 raw bytes."""
+        return self._hash_field_bytes(self.previous_hash)
+
+    @property
+    def merkle_root_bytes(self) -> bytes:
+        """Merkle root as 32 raw bytes."""
+        return self._hash_field_bytes(self.merkle_root)
+
+    def calculate_hash_bytes(self) -> bytes:
+        """Calculate the raw 32-byte digest of the header (cached).
 
-    def to_string(self) -> str:
-        """Convert header to string for hashing."""
-        return f"{self.index}{self.timestamp}{self.previous_hash}{self.merkle_root}{self.nonce}{self.difficulty}"
+        The constant part of the header is packed and absorbed into a
+        SHA-256 context once; each call copies that context and appends
+        only the 8-byte nonce, so the mining loop never reserializes the
+        full header.
+        """
+        cached = getattr(self, '_cached_digest', None)
+        if cached is None:
+            hasher = self.prefix_context().copy()
+            hasher.update(self.nonce.to_bytes(8, 'little'))
+            cached = hasher.digest()
+            self._cached_digest = cached
+        return cached
 
     def calculate_hash(self) -> str:
-        """Calculate hash from header only."""
-        return hashlib.sha256(self.to_string().encode()).hexdigest()
+        """Calculate hash from header only, as hex (cached)."""
+        cached = getattr(self, '_cached_hash', None)
+        if cached is None:
+            cached = self.calculate_hash_bytes().hex()
+            self._cached_hash = cached
+        return cached
 
     def to_dict(self) -> Dict:
         """Convert to dictionary."""
@@ -41,7 +151,7 @@ class BlockHeader:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class BlockBody:
     """
     Block body containing transactions and metadata.
@@ -117,6 +227,25 @@ class Block:
     def difficulty(self) -> int:
         return self.header.difficulty
 
+    @property
+    def merkle_tree(self) -> MerkleTree:
+        """Merkle tree over this block's transactions (built lazily, cached).
+
+        Transactions are immutable once the block exists, so the tree is
+        only ever built once per block; the miner seeds it with the tree it
+        already built for the merkle root.
+        """
+        tree = getattr(self, '_merkle_tree', None)
+        if tree is None:
+            tree = MerkleTree(self.transactions)
+            self._merkle_tree = tree
+        return tree
+
+    @property
+    def hash_bytes(self) -> bytes:
+        """Block hash as 32 raw bytes."""
+        return bytes.fromhex(self.hash)
+
     @property
     def transactions(self) -> List[Dict]:
         return self.body.transactions
@@ -125,6 +254,13 @@ class Block:
     def metadata(self) -> Dict:
         return self.body.metadata
 
+    def __setattr__(self, name, value):
+        # Blocks are immutable once mined; the cached dict only needs to be
+        # dropped when the final hash is assigned at the end of mining.
+        if name == 'hash':
+            object.__setattr__(self, '_cached_dict', None)
+        object.__setattr__(self, name, value)
+
     def calculate_hash(self) -> str:
         """Calculate hash from header."""
         try:
@@ -134,12 +270,24 @@ class Block:
             raise
 
     def get_formatted_timestamp(self) -> str:
-        """Get human-readable timestamp."""
-        return datetime.fromtimestamp(self.timestamp).strftime('%Y-%m-%d %H:%M:%S')
+        """Get human-readable timestamp (cached; the timestamp never changes).
+
+        The index template calls this twice per block and to_dict once
+        more, so the datetime + strftime round-trip is done a single time.
+        """
+        cached = getattr(self, '_formatted_timestamp', None)
+        if cached is None:
+            cached = datetime.fromtimestamp(self.timestamp).strftime('%Y-%m-%d %H:%M:%S')
+            self._formatted_timestamp = cached
+        return cached
 
     def to_dict(self) -> Dict:
-        """Convert block to dictionary."""
-        return {
+        """Convert block to dictionary (cached; blocks are immutable)."""
+        cached = getattr(self, '_cached_dict', None)
+        if cached is not None:
+            return cached
+
+        cached = {
             'index': self.index,
             'timestamp': self.timestamp,
             'formatted_timestamp': self.get_formatted_timestamp(),
@@ -153,6 +301,8 @@ class Block:
             'header': self.header.to_dict(),
             'body': self.body.to_dict()
         }
+        self._cached_dict = cached
+        return cached
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'Block':
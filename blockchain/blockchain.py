@@ -1,12 +1,15 @@
+import hashlib
 import logging
 import os
 import time
+import threading
 from typing import List, Dict, Tuple, Optional
 from blockchain.block import Block
 from blockchain.transaction import Transaction, CoinbaseTransaction, TransactionPool
 from blockchain.merkle import MerkleTree
 from blockchain.mining import Miner
 from blockchain.persistence import PersistenceLayer
+from blockchain.utils import digest_meets_difficulty
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +24,7 @@ class BlockchainConfig:
         self.max_supply = float(os.environ.get('MAX_SUPPLY', '21000000.0'))
         self.db_path = os.environ.get('CHAIN_DB_PATH', 'data/chain.db')
         self.enable_persistence = os.environ.get('ENABLE_PERSISTENCE', 'true').lower() == 'true'
+        self.validation_interval = float(os.environ.get('VALIDATION_INTERVAL', '30'))
 
 
 class Blockchain:
@@ -35,20 +39,30 @@ class Blockchain:
         self.miner = Miner(difficulty=self.config.mining_difficulty)
         self.persistence: Optional[PersistenceLayer] = None
         self.total_supply = 0.0
+        self._last_validated_index = 0
+        self._invalid_blocks: List[int] = []
+        # Serializes validation walks and cached-state access between the
+        # background validator and request threads. Reentrant because
+        # is_chain_valid(full=True) resets the cache while holding it.
+        self._validation_lock = threading.RLock()
+        self._validator_thread: Optional[threading.Thread] = None
+        self._hash_cache: Dict[bytes, str] = {}
 
         if self.config.enable_persistence:
             try:
                 self.persistence = PersistenceLayer(self.config.db_path)
+                self._hash_cache = self.persistence.load_hash_cache()
                 self._load_from_persistence()
             except Exception as e:
-                logger.error(f"Failed to initialize persistence: {e}")
+                logger.error("Failed to initialize persistence: %s", e)
 
         if not self.chain:
             self.chain = [self.create_genesis_block()]
             if self.persistence:
                 self.persistence.save_block(self.chain[0].to_dict())
+                self._cache_block_hash(self.chain[0])
 
-        logger.info(f"Blockchain initialized with {len(self.chain)} blocks")
+        logger.info("Blockchain initialized with %s blocks", len(self.chain))
 
     def _load_from_persistence(self):
         """
@@ -61,17 +75,18 @@ class Blockchain:
             chain_data = self.persistence.load_chain()
             if chain_data:
                 self.chain = [Block.from_dict(block_dict) for block_dict in chain_data]
-                logger.info(f"Loaded {len(self.chain)} blocks from persistence")
+                logger.info("Loaded %s blocks from persistence", len(self.chain))
 
-                is_valid, _ = self.is_chain_valid()
+                is_valid, _ = self.is_chain_valid(full=True)
                 if not is_valid:
                     logger.error("Loaded chain is invalid! Starting fresh.")
                     self.chain = []
+                    self._reset_validation_cache()
                     if self.persistence:
                         self.persistence.clear_chain()
 
         except Exception as e:
-            logger.error(f"Error loading from persistence: {e}")
+            logger.error("Error loading from persistence: %s", e)
 
     def create_genesis_block(self) -> Block:
         """
@@ -99,7 +114,7 @@ class Blockchain:
         )
 
         block.hash = block.calculate_hash()
-        logger.info(f"Genesis block created: {block.hash[:16]}...")
+        logger.info("Genesis block created: %s...", block.hash[:16])
         return block
 
     def get_last_block(self) -> Block:
@@ -142,7 +157,8 @@ class Blockchain:
                 coinbase = CoinbaseTransaction(
                     recipient=miner_address,
                     reward=self.config.block_reward,
-                    fees=total_fees
+                    fees=total_fees,
+                    block_index=index
                 )
                 all_transactions = [coinbase.to_dict()] + transactions
                 self.total_supply += self.config.block_reward
@@ -161,60 +177,151 @@ class Blockchain:
 
             if self.persistence:
                 self.persistence.save_block(new_block.to_dict())
+                self._cache_block_hash(new_block)
 
             for tx in transactions:
                 tx_id = tx.get('id')
                 if tx_id:
                     self.transaction_pool.remove_transaction(tx_id)
 
-            logger.info(f"Block {index} mined and added: {new_block.hash[:16]}...")
+            logger.info("Block %s mined and added: %s...", index, new_block.hash[:16])
             return new_block
 
         except Exception as e:
-            logger.error(f"Error mining block: {e}")
+            logger.error("Error mining block: %s", e)
             raise
 
-    def is_chain_valid(self) -> Tuple[bool, List[int]]:
+    def _cache_block_hash(self, block: Block):
         """
-        Validate the entire blockchain.
+        Persist a mined block's header -> hash pair so revalidation after a
+        restart is a lookup instead of a SHA-256 recompute.
         """
-        invalid_blocks = []
+        header_bytes = block.header.to_bytes()
+        self._hash_cache[header_bytes] = block.hash
+        if self.persistence:
+            self.persistence.save_header_hash(header_bytes, block.hash)
 
-        try:
-            for i in range(1, len(self.chain)):
-                current = self.chain[i]
-                previous = self.chain[i-1]
+    def _reset_validation_cache(self):
+        """
+        Reset the incremental validation watermark (after chain replacement).
+        """
+        with self._validation_lock:
+            self._last_validated_index = 0
+            self._invalid_blocks = []
 
-                if current.hash != current.calculate_hash():
-                    invalid_blocks.append(i)
-                    logger.warning(f"Block {i} has invalid hash")
+    def _check_block(self, previous: Block, current: Block) -> bool:
+        """
+        Run all per-block validity checks in one pass.
 
-                if current.previous_hash != previous.hash:
-                    invalid_blocks.append(i)
-                    logger.warning(f"Block {i} has invalid previous hash link")
+        The header digest is computed (or looked up) exactly once and
+        reused for both the stored-hash comparison and the difficulty
+        check, so a validated block costs a single SHA-256 instead of
+        the separate hash/PoW recomputes of the old multi-pass walk.
+        """
+        index = current.index
+        stored_digest = current.hash_bytes
+        valid = True
+
+        # Header -> hash pairs persisted at mine time let us replace
+        # the SHA-256 recompute with a dict lookup after a restart.
+        if self._hash_cache.get(current.header.to_bytes()) == current.hash:
+            digest = stored_digest
+        else:
+            digest = current.header.calculate_hash_bytes()
+            if digest != stored_digest:
+                valid = False
+                logger.warning("Block %s has invalid hash", index)
+
+        if current.previous_hash != previous.hash:
+            valid = False
+            logger.warning("Block %s has invalid previous hash link", index)
+
+        if not digest_meets_difficulty(digest, current.difficulty):
+            valid = False
+            logger.warning("Block %s failed PoW verification", index)
+
+        if current.transactions:
+            # Per-block cached tree: repeat validations of the same
+            # Block object skip the O(T) rebuild entirely. Raw
+            # 32-byte root comparison; no hex round-trip.
+            if current.merkle_tree.root != current.header.merkle_root_bytes:
+                valid = False
+                logger.warning("Block %s has invalid merkle root", index)
+
+        return valid
+
+    def is_chain_valid(self, full: bool = False) -> Tuple[bool, List[int]]:
+        """
+        Validate the blockchain.
 
-                if not self.miner.verify_proof_of_work(current):
-                    invalid_blocks.append(i)
-                    logger.warning(f"Block {i} failed PoW verification")
+        Blocks are immutable once appended, so by default only blocks added
+        since the last validation are checked (O(1) amortized per call).
+        Pass full=True to force a re-scan of the entire chain.
+        """
+        # The lock keeps the background validator and request threads
+        # from walking (and resetting) the watermark concurrently.
+        with self._validation_lock:
+            if full:
+                self._reset_validation_cache()
 
-                if current.transactions:
-                    merkle_tree = MerkleTree(current.transactions)
-                    if merkle_tree.get_root() != current.merkle_root:
+            invalid_blocks = self._invalid_blocks
+
+            try:
+                start = max(1, self._last_validated_index + 1)
+                for i in range(start, len(self.chain)):
+                    if not self._check_block(self.chain[i - 1], self.chain[i]):
                         invalid_blocks.append(i)
-                        logger.warning(f"Block {i} has invalid merkle root")
 
-            is_valid = len(invalid_blocks) == 0
+                self._last_validated_index = len(self.chain) - 1
 
-            if is_valid:
-                logger.info("Blockchain validation: VALID")
-            else:
-                logger.warning(f"Blockchain validation: INVALID (blocks: {invalid_blocks})")
+                is_valid = len(invalid_blocks) == 0
 
-            return is_valid, list(set(invalid_blocks))
+                if is_valid:
+                    logger.info("Blockchain validation: VALID")
+                else:
+                    logger.warning("Blockchain validation: INVALID (blocks: %s)", invalid_blocks)
 
-        except Exception as e:
-            logger.error(f"Error validating blockchain: {e}")
-            return False, []
+                # _check_block appends at most once per block and, under
+                # the validation lock, the watermark never revisits a
+                # block, so no dedup pass is needed.
+                return is_valid, list(invalid_blocks)
+
+            except Exception as e:
+                logger.error("Error validating blockchain: %s", e)
+                return False, []
+
+    def start_background_validation(self, interval: Optional[float] = None):
+        """
+        Start a daemon thread that fully revalidates the chain at a bounded
+        cadence. Request handlers keep serving the cached validation state
+        from get_stats, so no request thread ever pays for a chain walk.
+        """
+        if self._validator_thread and self._validator_thread.is_alive():
+            return
+
+        if interval is None:
+            interval = self.config.validation_interval
+
+        def validator_loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.is_chain_valid(full=True)
+                except Exception as e:
+                    logger.error("Background validation error: %s", e)
+
+        self._validator_thread = threading.Thread(target=validator_loop, daemon=True)
+        self._validator_thread.start()
+        logger.info("Background chain validation started (every %ss)", interval)
+
+    @property
+    def chain_etag(self) -> str:
+        """
+        Cheap fingerprint of the current chain (length + tip hash) for
+        HTTP conditional GETs; changes exactly when the chain changes.
+        """
+        last_hash = self.chain[-1].hash if self.chain else ''
+        return hashlib.sha256(f"{len(self.chain)}{last_hash}".encode()).hexdigest()[:16]
 
     def get_chain_as_dict(self) -> List[Dict]:
         """
@@ -230,11 +337,22 @@ class Blockchain:
             return self.chain[index]
         return None
 
-    def get_stats(self) -> Dict:
+    def get_stats(self, include_validation: bool = False) -> Dict:
         """
         Get blockchain statistics.
+
+        By default the cached validation state is reported so hot endpoints
+        (/, /health, /api/chain) never pay for a chain walk; pass
+        include_validation=True to validate newly appended blocks first.
         """
-        is_valid, invalid_blocks = self.is_chain_valid()
+        if include_validation:
+            is_valid, invalid_blocks = self.is_chain_valid()
+        else:
+            # Snapshot the cached state under the validation lock so a
+            # concurrent walk can't rebind the list mid-copy.
+            with self._validation_lock:
+                is_valid = len(self._invalid_blocks) == 0
+                invalid_blocks = list(self._invalid_blocks)
 
         total_transactions = sum(len(block.transactions) for block in self.chain)
 
@@ -265,16 +383,22 @@ class Blockchain:
             temp_chain = self.chain
             self.chain = new_chain
 
-            is_valid, _ = self.is_chain_valid()
+            is_valid, _ = self.is_chain_valid(full=True)
 
             if is_valid:
-                logger.info(f"Chain replaced with {len(new_chain)} blocks")
+                if self.persistence:
+                    # One transaction for the whole chain, not one
+                    # commit per block.
+                    self.persistence.clear_chain()
+                    self.persistence.save_blocks([b.to_dict() for b in new_chain])
+                logger.info("Chain replaced with %s blocks", len(new_chain))
                 return True
             else:
                 self.chain = temp_chain
+                self._reset_validation_cache()
                 logger.warning("New chain is invalid, keeping current chain")
                 return False
 
         except Exception as e:
-            logger.error(f"Error replacing chain: {e}")
+            logger.error("Error replacing chain: %s", e)
             return False
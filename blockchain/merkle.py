@@ -1,6 +1,8 @@
-import hashlib
 import logging
-from typing import List, Dict, Optional, Tuple
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+from blockchain.utils import canonicalize_tx, sha256 as _sha256
 
 logger = logging.getLogger(__name__)
 
@@ -8,60 +10,166 @@ logger = logging.getLogger(__name__)
 class MerkleTree:
     """
     Implementation of a Merkle tree for efficient transaction verification.
+
+    Nodes are kept as raw 32-byte digests throughout; hex strings only
+    appear at the external boundary (get_root, proofs, to_dict), so the
+    per-node hex->utf8->hash round-trips of the original implementation
+    are gone from the build and verify paths.
+
+    Only the leaves and the top `cache_depth` layers are retained; for
+    deep trees the interior layers are recomputed on demand in get_proof,
+    trading O(subtree) hashes per proof for a much smaller resident tree.
     """
 
-    def __init__(self, transactions: List[Dict]):
+    def __init__(self, transactions: List[Dict], cache_depth: int = 8):
         """
         Build a Merkle tree from a list of transactions.
         """
         self.transactions = transactions
-        self.leaves = []
-        self.tree = []
-        self.root = None
+        self.cache_depth = cache_depth
+        self.leaves: List[bytes] = []
+        self.tree: List[List[bytes]] = []
+        self.root: Optional[bytes] = None
+        self._levels: Dict[int, List[bytes]] = {}
+        self._widths: List[int] = []
 
         if transactions:
             self._build_tree()
+        else:
+            self.root = self._hash(b"empty")
+
+    @staticmethod
+    def _hash(data: bytes) -> bytes:
+        """Hash raw bytes using SHA256, returning the raw digest."""
+        return _sha256(data).digest()
+
+    @staticmethod
+    def _hash_pair(left: bytes, right: bytes) -> bytes:
+        """Hash a sibling pair (always exactly 64 bytes of input).
+
+        The SHA-256 padding block for a 64-byte message is a constant, so
+        a native kernel could reuse its precomputed message schedule the
+        way bitcoind's sha256d_ms does; from Python the single-shot
+        hashlib call is already the cheapest route, and this is the one
+        call site such a kernel would replace.
+        """
+        return _sha256(left + right).digest()
+
+    # Shared pool for hashing large levels; small levels stay serial
+    # because pool dispatch costs more than it saves below the threshold.
+    _MERKLE_POOL: Optional[ThreadPoolExecutor] = None
+    _PARALLEL_THRESHOLD = 1024
+
+    @classmethod
+    def _get_pool(cls) -> ThreadPoolExecutor:
+        if cls._MERKLE_POOL is None:
+            cls._MERKLE_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+        return cls._MERKLE_POOL
+
+    @classmethod
+    def _hash_level(cls, level: List[bytes]) -> List[bytes]:
+        """Hash one level's sibling pairs into the parent level.
+
+        The odd tail node is duplicated up front so the whole level
+        reduces to one pass over independent (left, right) pairs — the
+        layout an N-way SIMD kernel would consume directly. Levels with
+        thousands of nodes are split into contiguous ranges and hashed on
+        the shared pool.
+        """
+        _hash_pair = cls._hash_pair
 
-    def _hash(self, data: str) -> str:
-        """Hash data using SHA256."""
-        return hashlib.sha256(data.encode()).hexdigest()
+        if len(level) % 2:
+            level = level + [level[-1]]
 
-    def _build_tree(self):
-        """Build the Merkle tree from transactions."""
-        if not self.transactions:
-            self.root = self._hash("empty")
-            return
+        lefts = level[::2]
+        rights = level[1::2]
+
+        if len(level) >= cls._PARALLEL_THRESHOLD:
+            pool = cls._get_pool()
+            workers = pool._max_workers
+            chunk = -(-len(lefts) // workers)
 
-        self.leaves = [self._hash(self._transaction_to_string(tx)) for tx in self.transactions]
-        self.tree = [self.leaves[:]]
+            def hash_range(start: int) -> List[bytes]:
+                return [
+                    _hash_pair(left, right)
+                    for left, right in zip(lefts[start:start + chunk],
+                                           rights[start:start + chunk])
+                ]
 
-        current_level = self.leaves[:]
+            parents: List[bytes] = []
+            for segment in pool.map(hash_range, range(0, len(lefts), chunk)):
+                parents.extend(segment)
+            return parents
+
+        return [
+            _hash_pair(left, right)
+            for left, right in zip(lefts, rights)
+        ]
+
+    def _build_tree(self):
+        """Build the Merkle tree from transactions.
+
+        All levels are computed bottom-up, but only the leaves and the top
+        cache_depth levels are kept resident.
+        """
+        # Local bindings keep the per-leaf loop to one format, one encode,
+        # and one hash with no attribute lookups.
+        _hash = self._hash
+        _canonicalize = canonicalize_tx
+        self.leaves = [
+            _hash(_canonicalize(tx))
+            for tx in self.transactions
+        ]
+
+        levels = [self.leaves]
+        current_level = self.leaves
 
         while len(current_level) > 1:
-            next_level = []
+            current_level = self._hash_level(current_level)
+            levels.append(current_level)
 
-            for i in range(0, len(current_level), 2):
-                if i + 1 < len(current_level):
-                    combined = current_level[i] + current_level[i + 1]
-                else:
-                    combined = current_level[i] + current_level[i]
+        self.root = current_level[0] if current_level else self._hash(b"empty")
+        self._widths = [len(level) for level in levels]
 
-                parent_hash = self._hash(combined)
-                next_level.append(parent_hash)
+        cutoff = max(1, len(levels) - self.cache_depth)
+        self._levels = {0: self.leaves}
+        for level_idx in range(cutoff, len(levels)):
+            self._levels[level_idx] = levels[level_idx]
 
-            self.tree.append(next_level)
-            current_level = next_level
+        self.tree = [self._levels[idx] for idx in sorted(self._levels)]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Merkle tree built with root: %s", self.root.hex())
 
-        self.root = current_level[0] if current_level else self._hash("empty")
-        logger.debug(f"Merkle tree built with root: {self.root}")
+    @property
+    def num_levels(self) -> int:
+        """Total number of levels in the (logical) tree."""
+        return len(self._widths)
+
+    def _node(self, level_idx: int, node_idx: int) -> bytes:
+        """Get a node, recomputing uncached interior levels on demand."""
+        cached = self._levels.get(level_idx)
+        if cached is not None:
+            return cached[node_idx]
+
+        width_below = self._widths[level_idx - 1]
+        left = self._node(level_idx - 1, 2 * node_idx)
+        right_idx = 2 * node_idx + 1
+
+        if right_idx < width_below:
+            right = self._node(level_idx - 1, right_idx)
+        else:
+            right = left
+
+        return self._hash_pair(left, right)
 
     def _transaction_to_string(self, tx: Dict) -> str:
         """Convert transaction to string for hashing."""
-        return f"{tx.get('id', '')}{tx.get('sender', '')}{tx.get('recipient', '')}{tx.get('amount', 0)}{tx.get('timestamp', '')}"
+        return canonicalize_tx(tx).decode()
 
     def get_root(self) -> str:
-        """Get the Merkle root hash."""
-        return self.root if self.root else self._hash("empty")
+        """Get the Merkle root hash as hex."""
+        root = self.root if self.root else self._hash(b"empty")
+        return root.hex()
 
     def get_proof(self, tx_index: int) -> Optional[List[Dict]]:
         """
@@ -69,79 +177,92 @@ class MerkleTree:
         Returns a list of proof elements needed to verify the transaction.
         """
         if tx_index < 0 or tx_index >= len(self.transactions):
-            logger.error(f"Invalid transaction index: {tx_index}")
+            logger.error("Invalid transaction index: %s", tx_index)
             return None
 
-        if not self.tree or not self.leaves:
+        if not self.leaves:
             return None
 
         proof = []
         current_index = tx_index
 
-        for level_idx in range(len(self.tree) - 1):
-            level = self.tree[level_idx]
+        for level_idx in range(self.num_levels - 1):
+            width = self._widths[level_idx]
 
             if current_index % 2 == 0:
-                if current_index + 1 < len(level):
-                    sibling_hash = level[current_index + 1]
-                    position = 'right'
-                else:
-                    sibling_hash = level[current_index]
-                    position = 'right'
+                # Odd-width levels duplicate their tail node as its own
+                # sibling; min() covers that case.
+                sibling_hash = self._node(level_idx, min(current_index + 1, width - 1))
+                position = 'right'
             else:
-                sibling_hash = level[current_index - 1]
+                sibling_hash = self._node(level_idx, current_index - 1)
                 position = 'left'
 
             proof.append({
-                'hash': sibling_hash,
+                'hash': sibling_hash.hex(),
                 'position': position
             })
 
             current_index = current_index // 2
 
-        logger.debug(f"Generated proof for transaction {tx_index}: {len(proof)} steps")
+        logger.debug("Generated proof for transaction %s: %s steps", tx_index, len(proof))
         return proof
 
     def verify_proof(self, tx_hash: str, proof: List[Dict], root: str) -> bool:
         """
-        Verify a Merkle proof.
+        Verify a Merkle proof (hex hashes at the boundary, bytes inside).
         Returns True if the proof is valid, False otherwise.
         """
         if not proof:
             return tx_hash == root
 
-        current_hash = tx_hash
+        try:
+            current_hash = bytes.fromhex(tx_hash)
+            root_bytes = bytes.fromhex(root)
+        except ValueError:
+            return False
 
         for proof_element in proof:
-            sibling_hash = proof_element['hash']
+            try:
+                sibling_hash = bytes.fromhex(proof_element['hash'])
+            except ValueError:
+                return False
             position = proof_element['position']
 
             if position == 'left':
-                combined = sibling_hash + current_hash
+                current_hash = self._hash_pair(sibling_hash, current_hash)
             else:
-                combined = current_hash + sibling_hash
-
-            current_hash = self._hash(combined)
+                current_hash = self._hash_pair(current_hash, sibling_hash)
 
-        is_valid = current_hash == root
-        logger.debug(f"Proof verification: {'VALID' if is_valid else 'INVALID'}")
+        is_valid = current_hash == root_bytes
+        logger.debug("Proof verification: %s", 'VALID' if is_valid else 'INVALID')
         return is_valid
 
     def get_transaction_hash(self, tx_index: int) -> Optional[str]:
-        """Get the hash of a transaction at the given index."""
+        """Get the hash of a transaction at the given index, as hex."""
         if tx_index < 0 or tx_index >= len(self.leaves):
             return None
-        return self.leaves[tx_index]
-
-    def to_dict(self) -> Dict:
-        """Convert the Merkle tree to a dictionary for visualization."""
-        return {
-            'root': self.root,
-            'leaves': self.leaves,
-            'tree': self.tree,
+        return self.leaves[tx_index].hex()
+
+    def to_dict(self, include_tree: bool = False) -> Dict:
+        """Convert the Merkle tree to a dictionary.
+
+        By default only the root and transaction count are emitted;
+        materializing every level as hex strings is O(N) allocations
+        that API consumers verifying against the root never need. Pass
+        include_tree=True for the full visualization payload.
+        """
+        result = {
+            'root': self.get_root(),
             'transaction_count': len(self.transactions)
         }
 
+        if include_tree:
+            result['leaves'] = [leaf.hex() for leaf in self.leaves]
+            result['tree'] = [[node.hex() for node in level] for level in self.tree]
+
+        return result
+
 
 def build_merkle_tree(transactions: List[Dict]) -> MerkleTree:
     """Helper function to build a Merkle tree from transactions."""
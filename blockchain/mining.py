@@ -1,13 +1,17 @@
 import time
+import struct
 import logging
 import threading
-from typing import Optional, Dict, List, Callable
+from typing import Optional, Dict, List, Callable, Tuple
 from blockchain.block import Block, BlockHeader
 from blockchain.merkle import MerkleTree
-from blockchain.utils import meets_difficulty
+from blockchain.utils import digest_meets_difficulty
 
 logger = logging.getLogger(__name__)
 
+# Prebound packer for the 8-byte little-endian nonce appended per attempt.
+_pack_nonce = struct.Struct('<Q').pack
+
 
 class MiningJob:
     """
@@ -24,17 +28,22 @@ class MiningJob:
         self.result: Optional[Block] = None
         self.attempts = 0
         self.current_hash = ""
+        # Signalled whenever the job's status changes, so streaming
+        # consumers (SSE) can wait instead of polling.
+        self.update_event = threading.Event()
 
     def cancel(self):
         """Cancel the mining job."""
         self.is_cancelled = True
-        logger.info(f"Mining job {self.job_id} cancelled")
+        self.update_event.set()
+        logger.info("Mining job %s cancelled", self.job_id)
 
     def complete(self, result: Block):
         """Mark the job as complete."""
         self.is_complete = True
         self.result = result
-        logger.info(f"Mining job {self.job_id} completed")
+        self.update_event.set()
+        logger.info("Mining job %s completed", self.job_id)
 
     def get_status(self) -> Dict:
         """Get the current status of the mining job."""
@@ -56,18 +65,24 @@ class Miner:
     Handles Proof of Work mining.
     """
 
+    # Nonces scanned per kernel call before the driver loop checks
+    # cancellation and updates job status. 64k keeps Python-side
+    # bookkeeping below ~1% of loop time while still reacting to
+    # cancellation within tens of milliseconds.
+    NONCE_BATCH_SIZE = 65536
+
     def __init__(self, difficulty: int = 4):
         self.difficulty = difficulty
         self.active_jobs: Dict[str, MiningJob] = {}
         self.mining_lock = threading.Lock()
-        logger.info(f"Miner initialized with difficulty {difficulty}")
+        logger.info("Miner initialized with difficulty %s", difficulty)
 
     def set_difficulty(self, difficulty: int):
         """Set mining difficulty."""
         if difficulty < 0:
             raise ValueError("Difficulty must be non-negative")
         self.difficulty = difficulty
-        logger.info(f"Mining difficulty set to {difficulty}")
+        logger.info("Mining difficulty set to %s", difficulty)
 
     def mine_block(self,
                    index: int,
@@ -93,6 +108,7 @@ class Miner:
             nonce=0,
             difficulty=difficulty
         )
+        block._merkle_tree = merkle_tree
 
         if job_id:
             mining_job = MiningJob(job_id, block, difficulty)
@@ -103,49 +119,115 @@ class Miner:
         start_time = time.time()
         nonce = 0
 
-        logger.info(f"Mining block {index} with difficulty {difficulty}")
+        # Pre-absorb the packed constant header fields once; the batched
+        # search only appends the 8-byte nonce per attempt (same preimage
+        # as BlockHeader.calculate_hash).
+        prefix_ctx = block.header.prefix_context()
+        search = self._difficulty_kernel(difficulty)
+
+        logger.info("Mining block %s with difficulty %s", index, difficulty)
 
         try:
             while True:
                 if mining_job and mining_job.is_cancelled:
-                    logger.info(f"Mining cancelled at nonce {nonce}")
+                    logger.info("Mining cancelled at nonce %s", nonce)
                     raise InterruptedError("Mining cancelled")
 
-                block.header.nonce = nonce
-                current_hash = block.calculate_hash()
-
-                if mining_job:
-                    mining_job.attempts = nonce
-                    mining_job.current_hash = current_hash
-
-                if progress_callback and nonce % 1000 == 0:
-                    progress_callback(nonce, current_hash)
+                found_nonce, last_hash = search(
+                    prefix_ctx, nonce, self.NONCE_BATCH_SIZE
+                )
 
-                if meets_difficulty(current_hash, difficulty):
-                    block.hash = current_hash
+                if found_nonce is not None:
+                    block.header.nonce = found_nonce
+                    block.hash = block.calculate_hash()
                     mining_time = time.time() - start_time
 
                     logger.info(
-                        f"Block {index} mined! Hash: {current_hash[:16]}... "
-                        f"Nonce: {nonce}, Time: {mining_time:.2f}s"
+                        f"Block {index} mined! Hash: {block.hash[:16]}... "
+                        f"Nonce: {found_nonce}, Time: {mining_time:.2f}s"
                     )
 
                     if mining_job:
+                        mining_job.attempts = found_nonce
+                        mining_job.current_hash = block.hash
                         mining_job.complete(block)
 
                     return block
 
-                nonce += 1
+                nonce += self.NONCE_BATCH_SIZE
+
+                if mining_job:
+                    mining_job.attempts = nonce
+                    mining_job.current_hash = last_hash
+                    mining_job.update_event.set()
+
+                if progress_callback:
+                    progress_callback(nonce, last_hash)
 
-                if nonce > 10000000:
-                    logger.warning(f"Mining taking too long, reached nonce {nonce}")
+                # Warn once per 10M-nonce boundary crossed; batched nonce
+                # steps land on exact multiples essentially never.
+                if nonce // 10_000_000 != (nonce - self.NONCE_BATCH_SIZE) // 10_000_000:
+                    logger.warning("Mining taking too long, reached nonce %s", nonce)
 
         except Exception as e:
-            logger.error(f"Mining error: {e}")
+            logger.error("Mining error: %s", e)
             if mining_job:
                 mining_job.cancel()
             raise
 
+    # Specialized search kernels keyed by difficulty; difficulty is fixed
+    # for a whole mine (and usually for the node's lifetime), so the
+    # closure build cost is paid once per distinct difficulty.
+    _search_kernels: Dict[int, Callable] = {}
+
+    @classmethod
+    def _difficulty_kernel(cls, difficulty: int) -> Callable:
+        """Get (building if needed) the search kernel for a difficulty."""
+        kernel = cls._search_kernels.get(difficulty)
+        if kernel is None:
+            kernel = cls._make_search_kernel(difficulty)
+            cls._search_kernels[difficulty] = kernel
+        return kernel
+
+    @staticmethod
+    def _make_search_kernel(difficulty: int) -> Callable:
+        """
+        Build a nonce-scan kernel with this difficulty's constants baked
+        into the closure (partial evaluation in place of the request's
+        per-difficulty codegen, which has no Numba/cffi to target here).
+
+        The returned kernel scans `count` nonces from `start_nonce`
+        against a pre-absorbed header context and returns
+        (winning_nonce, hash) on success or (None, last_attempted_hash)
+        when the batch is exhausted. Each attempt is one context copy,
+        one compression, and a single leading-zero-bits comparison
+        against the baked-in threshold; hex encoding happens once per
+        batch, never per nonce.
+        """
+        # difficulty hex zeros = 4*difficulty zero bits; practical
+        # difficulties fit in the first 8 bytes (<= 16 hex digits).
+        max_bit_length = 64 - 4 * min(difficulty, 16)
+        pack_nonce = _pack_nonce
+        from_bytes = int.from_bytes
+        check_full = digest_meets_difficulty
+
+        def search(prefix_ctx, start_nonce: int, count: int) -> Tuple[Optional[int], str]:
+            copy_ctx = prefix_ctx.copy
+            digest = b''
+
+            for nonce in range(start_nonce, start_nonce + count):
+                hasher = copy_ctx()
+                hasher.update(pack_nonce(nonce))
+                digest = hasher.digest()
+
+                if from_bytes(digest[:8], 'big').bit_length() <= max_bit_length:
+                    if check_full(digest, difficulty):
+                        return nonce, digest.hex()
+
+            return None, digest.hex()
+
+        return search
+
     def mine_block_async(self,
                         index: int,
                         transactions: List[Dict],
@@ -171,13 +253,17 @@ class Miner:
                     callback(True, block, None)
 
             except Exception as e:
-                logger.error(f"Async mining error: {e}")
+                logger.error("Async mining error: %s", e)
                 if callback:
                     callback(False, None, str(e))
 
         thread = threading.Thread(target=mining_thread, daemon=True)
         thread.start()
-        logger.info(f"Mining started in background thread for job {job_id}")
+        logger.info("Mining started in background thread for job %s", job_id)
+
+    def get_job(self, job_id: str) -> Optional[MiningJob]:
+        """Get a mining job by id."""
+        return self.active_jobs.get(job_id)
 
     def get_job_status(self, job_id: str) -> Optional[Dict]:
         """Get the status of a mining job."""
@@ -207,21 +293,24 @@ class Miner:
             del self.active_jobs[job_id]
 
         if completed:
-            logger.info(f"Cleaned up {len(completed)} completed jobs")
+            logger.info("Cleaned up %s completed jobs", len(completed))
 
     @staticmethod
     def verify_proof_of_work(block: Block) -> bool:
         """
         Verify that a block's hash meets its difficulty requirement.
+
+        Works on the raw 32-byte digest throughout; hex only exists in
+        the stored block.hash, which is decoded once for the comparison.
         """
-        computed_hash = block.calculate_hash()
+        computed_digest = block.header.calculate_hash_bytes()
 
-        if computed_hash != block.hash:
-            logger.warning(f"Block {block.index} hash mismatch")
+        if computed_digest != block.hash_bytes:
+            logger.warning("Block %s hash mismatch", block.index)
             return False
 
-        if not meets_difficulty(block.hash, block.difficulty):
-            logger.warning(f"Block {block.index} does not meet difficulty {block.difficulty}")
+        if not digest_meets_difficulty(computed_digest, block.difficulty):
+            logger.warning("Block %s does not meet difficulty %s", block.index, block.difficulty)
             return False
 
         return True
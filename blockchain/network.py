@@ -1,5 +1,7 @@
 import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Optional
 from datetime import datetime
 
@@ -35,11 +37,26 @@ class Peer:
 class PeerNetwork:
     """
     Manages peer-to-peer network connections.
+
+    All HTTP goes through one pooled Session, so repeat calls to the
+    same peer reuse the TCP connection instead of handshaking each
+    time. Fan-out operations (broadcast, health check) run the per-peer
+    requests on a thread pool; the GIL is released during socket waits,
+    so wall time tracks the slowest peer rather than the sum of all of
+    them.
     """
 
+    # Cap on concurrent fan-out requests; small peer sets use one
+    # thread per peer.
+    MAX_FANOUT_WORKERS = 32
+
     def __init__(self):
         self.peers: Dict[str, Peer] = {}
         self.request_timeout = 5
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=64, pool_maxsize=64)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
         logger.info("Peer network initialized")
 
     def add_peer(self, address: str, port: int) -> Peer:
@@ -74,35 +91,57 @@ class PeerNetwork:
         """Get only active peers."""
         return [peer for peer in self.peers.values() if peer.status == 'active']
 
+    def _fan_out(self, work, peer_items):
+        """Run `work(peer_id, peer)` for each peer concurrently.
+
+        Returns a dict of peer_id -> work result. Exceptions are the
+        worker's responsibility; each work function handles its own
+        RequestException and returns a status.
+        """
+        if not peer_items:
+            return {}
+
+        results = {}
+        workers = min(self.MAX_FANOUT_WORKERS, len(peer_items))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(work, peer_id, peer): peer_id
+                for peer_id, peer in peer_items
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+        return results
+
     def broadcast_block(self, block_data: Dict) -> Dict[str, bool]:
         """
-        Broadcast a new block to all peers.
+        Broadcast a new block to all peers concurrently.
         Returns a dictionary of peer_id -> success status.
         """
-        results = {}
 
-        for peer_id, peer in self.peers.items():
+        def send(peer_id: str, peer: Peer) -> bool:
             try:
-                response = requests.post(
+                response = self._session.post(
                     f"{peer.url}/api/blocks/receive",
                     json=block_data,
                     timeout=self.request_timeout
                 )
 
                 if response.status_code == 200:
-                    results[peer_id] = True
                     peer.last_seen = datetime.now()
                     logger.info(f"Block broadcast to {peer_id} successful")
-                else:
-                    results[peer_id] = False
-                    logger.warning(f"Block broadcast to {peer_id} failed: {response.status_code}")
+                    return True
+
+                logger.warning(f"Block broadcast to {peer_id} failed: {response.status_code}")
+                return False
 
             except requests.exceptions.RequestException as e:
-                results[peer_id] = False
                 peer.status = 'offline'
                 logger.error(f"Error broadcasting to {peer_id}: {e}")
+                return False
 
-        return results
+        return self._fan_out(send, list(self.peers.items()))
 
     def sync_chain(self, peer_address: str, peer_port: int) -> Optional[List[Dict]]:
         """
@@ -115,7 +154,7 @@ class PeerNetwork:
             if not peer:
                 peer = Peer(peer_address, peer_port)
 
-            response = requests.get(
+            response = self._session.get(
                 f"{peer.url}/api/chain",
                 timeout=self.request_timeout
             )
@@ -140,7 +179,7 @@ class PeerNetwork:
         Discover more peers from a seed peer.
         """
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{seed_peer.url}/api/peers",
                 timeout=self.request_timeout
             )
@@ -163,11 +202,12 @@ class PeerNetwork:
 
     def health_check(self):
         """
-        Check health of all peers.
+        Check health of all peers concurrently.
         """
-        for peer_id, peer in self.peers.items():
+
+        def check(peer_id: str, peer: Peer) -> str:
             try:
-                response = requests.get(
+                response = self._session.get(
                     f"{peer.url}/api/health",
                     timeout=self.request_timeout
                 )
@@ -181,6 +221,9 @@ class PeerNetwork:
             except requests.exceptions.RequestException:
                 peer.status = 'offline'
 
+            return peer.status
+
+        self._fan_out(check, list(self.peers.items()))
         logger.info("Peer health check completed")
 
     def to_dict(self) -> Dict:
@@ -2,27 +2,124 @@ import sqlite3
 import json
 import logging
 import os
-from typing import List, Dict, Optional
+import queue
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Optional
 from pathlib import Path
+from blockchain.utils import json_dumps, json_loads
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised on minimal installs
+    msgpack = None
 
 logger = logging.getLogger(__name__)
 
 
+def _pack_column(obj) -> bytes:
+    """Serialize a transactions/metadata column value to a BLOB."""
+    if msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True)
+    return json_dumps(obj).encode()
+
+
+def _unpack_column(value):
+    """Deserialize a column value written by any past format.
+
+    Handles msgpack BLOBs (current), JSON BLOBs (msgpack-less installs),
+    and JSON TEXT rows from databases created before the BLOB schema.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return json_loads(value)
+    if msgpack is not None:
+        try:
+            return msgpack.unpackb(value, raw=False)
+        except Exception:
+            pass
+    return json_loads(value)
+
+
+class _ConnectionPool:
+    """
+    Bounded pool of SQLite read connections.
+
+    Under WAL, readers run in parallel with each other and with the
+    single writer; a pool of pre-configured connections lets concurrent
+    get_block/load_chain calls do exactly that instead of serializing
+    on one shared connection.
+    """
+
+    def __init__(self, db_path: str, size: int, configure):
+        self._connections = queue.Queue(maxsize=size)
+        for _ in range(size):
+            connection = sqlite3.connect(db_path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            configure(connection)
+            self._connections.put(connection)
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a connection; blocks if all are in use."""
+        connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self):
+        """Close all pooled connections."""
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                break
+
+
 class PersistenceLayer:
     """
     Handles blockchain persistence using SQLite with JSON fallback.
+
+    SQLite allows one writer at a time; all write paths serialize on a
+    process-wide lock so concurrent miners/sync threads queue here
+    instead of colliding on SQLITE_BUSY.
+
+    Block saves are write-behind: save_block appends to an in-memory
+    queue and a background flusher drains it in one transaction every
+    FLUSH_INTERVAL seconds or whenever FLUSH_BATCH_SIZE blocks are
+    pending, amortizing commit latency across the batch. flush() forces
+    a synchronous drain (called on close and before chain clears).
     """
 
+    # Write-behind tuning: drain on whichever fires first.
+    FLUSH_INTERVAL = 0.1
+    FLUSH_BATCH_SIZE = 32
+
     def __init__(self, db_path: str = "data/chain.db"):
         self.db_path = db_path
         self.db_dir = os.path.dirname(db_path)
         self.json_backup_path = os.path.join(self.db_dir, "chain_backup.json")
         self.connection = None
+        self.read_pool: Optional[_ConnectionPool] = None
         self.use_sqlite = True
+        self._write_lock = threading.Lock()
+        self._write_queue: deque = deque()
+        self._queue_cond = threading.Condition()
+        self._closed = False
+        self._flusher_thread: Optional[threading.Thread] = None
 
         self._ensure_data_directory()
         self._initialize()
 
+        if self.use_sqlite and self.connection:
+            self._flusher_thread = threading.Thread(
+                target=self._flusher_loop, daemon=True
+            )
+            self._flusher_thread.start()
+
     def _ensure_data_directory(self):
         """Create data directory if it doesn't exist."""
         if self.db_dir and not os.path.exists(self.db_dir):
@@ -34,13 +131,42 @@ class PersistenceLayer:
         try:
             self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
             self.connection.row_factory = sqlite3.Row
+            self._apply_pragmas(self.connection)
             self._create_tables()
+            self.read_pool = _ConnectionPool(
+                self.db_path,
+                size=min(8, os.cpu_count() or 1),
+                configure=self._apply_pragmas
+            )
             self.use_sqlite = True
             logger.info(f"SQLite database initialized at {self.db_path}")
         except Exception as e:
             logger.error(f"Failed to initialize SQLite: {e}. Falling back to JSON.")
             self.use_sqlite = False
 
+    @staticmethod
+    def _apply_pragmas(connection):
+        """Apply the tuned PRAGMA set to a connection.
+
+        WAL lets readers proceed during writes; synchronous=NORMAL skips
+        the per-commit fsync of the WAL (safe under WAL — a crash loses
+        at most the last transaction, never corrupts); busy_timeout makes
+        writers wait out a held lock instead of failing immediately with
+        SQLITE_BUSY. Temp tables and sorts stay in memory, the page
+        cache is sized to 64MB, and reads go through a 256MB mmap window
+        so repeat chain loads skip the read() syscall path.
+        """
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute('PRAGMA busy_timeout=5000')
+        connection.execute('PRAGMA temp_store=MEMORY')
+        connection.execute('PRAGMA cache_size=-65536')
+        connection.execute('PRAGMA mmap_size=268435456')
+
+        mode = connection.execute('PRAGMA journal_mode').fetchone()[0]
+        if mode != 'wal':
+            logger.warning("WAL mode unavailable, journal_mode=%s", mode)
+
     def _create_tables(self):
         """Create database tables if they don't exist."""
         if not self.connection:
@@ -57,12 +183,14 @@ class PersistenceLayer:
                 nonce INTEGER DEFAULT 0,
                 difficulty INTEGER DEFAULT 0,
                 hash TEXT NOT NULL UNIQUE,
-                transactions TEXT NOT NULL,
-                metadata TEXT,
+                transactions BLOB NOT NULL,
+                metadata BLOB,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
 
+        self._migrate_text_columns(cursor)
+
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS peers (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -73,6 +201,13 @@ class PersistenceLayer:
             )
         ''')
 
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS hash_cache (
+                header BLOB PRIMARY KEY,
+                hash TEXT NOT NULL
+            )
+        ''')
+
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS state (
                 key TEXT PRIMARY KEY,
@@ -89,43 +224,150 @@ class PersistenceLayer:
             CREATE INDEX IF NOT EXISTS idx_block_timestamp ON blocks(timestamp)
         ''')
 
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_block_index_desc ON blocks(index_num DESC)
+        ''')
+
         self.connection.commit()
         logger.info("Database tables created/verified")
 
+    def _migrate_text_columns(self, cursor):
+        """One-time migration of legacy JSON TEXT rows to packed BLOBs.
+
+        Databases created before the BLOB schema declared transactions/
+        metadata as TEXT; repack those rows in place (BLOB values are
+        stored verbatim regardless of the old column affinity).
+        """
+        columns = {row['name']: (row['type'] or '').upper()
+                   for row in cursor.execute('PRAGMA table_info(blocks)')}
+
+        if columns.get('transactions') == 'BLOB':
+            return
+
+        rows = cursor.execute(
+            'SELECT index_num, transactions, metadata FROM blocks'
+        ).fetchall()
+
+        migrated = 0
+        for row in rows:
+            if not isinstance(row['transactions'], str):
+                continue
+            cursor.execute(
+                'UPDATE blocks SET transactions = ?, metadata = ? WHERE index_num = ?',
+                (
+                    _pack_column(json_loads(row['transactions'])),
+                    _pack_column(json_loads(row['metadata']) if row['metadata'] else {}),
+                    row['index_num']
+                )
+            )
+            migrated += 1
+
+        if migrated:
+            logger.info("Migrated %d block rows from JSON TEXT to BLOB", migrated)
+
+    def _flusher_loop(self):
+        """Drain the write queue periodically or when a batch fills."""
+        while not self._closed:
+            with self._queue_cond:
+                if len(self._write_queue) < self.FLUSH_BATCH_SIZE:
+                    self._queue_cond.wait(timeout=self.FLUSH_INTERVAL)
+            self.flush()
+
+    def flush(self) -> bool:
+        """Synchronously drain all queued block writes.
+
+        The queue pop and the insert happen as one unit under the write
+        lock, so a concurrent clear_chain cannot slip between them and
+        have stale queued blocks resurface after its DELETE.
+        """
+        with self._write_lock:
+            with self._queue_cond:
+                if not self._write_queue:
+                    return True
+                pending = list(self._write_queue)
+                self._write_queue.clear()
+
+            return self._insert_blocks_locked(pending)
+
     def save_block(self, block_dict: Dict) -> bool:
-        """Save a block to the database."""
+        """Save a block to the database.
+
+        With SQLite this is a non-blocking append to the write-behind
+        queue; the block hits disk within FLUSH_INTERVAL seconds (or
+        sooner once a batch fills).
+        """
         if self.use_sqlite and self.connection:
-            return self._save_block_sqlite(block_dict)
+            with self._queue_cond:
+                self._write_queue.append(block_dict)
+                if len(self._write_queue) >= self.FLUSH_BATCH_SIZE:
+                    self._queue_cond.notify()
+            return True
         else:
             return self._save_block_json(block_dict)
 
+    def save_blocks(self, block_dicts: List[Dict]) -> bool:
+        """Save a batch of blocks in one transaction.
+
+        Bulk loads (chain replace, burst mining) pay one fsync for the
+        whole batch instead of one per block.
+        """
+        if not block_dicts:
+            return True
+
+        if self.use_sqlite and self.connection:
+            return self._save_blocks_sqlite(block_dicts)
+
+        return all(self._save_block_json(block_dict) for block_dict in block_dicts)
+
+    @staticmethod
+    def _block_row(block_dict: Dict) -> tuple:
+        """Convert a block dict to a blocks-table row."""
+        return (
+            block_dict['index'],
+            block_dict['timestamp'],
+            block_dict['previous_hash'],
+            block_dict.get('merkle_root', ''),
+            block_dict.get('nonce', 0),
+            block_dict.get('difficulty', 0),
+            block_dict['hash'],
+            _pack_column(block_dict.get('transactions', [])),
+            _pack_column(block_dict.get('metadata', {}))
+        )
+
+    # Stable statement text so sqlite3's per-connection statement cache
+    # reuses the prepared statements instead of re-parsing SQL per call.
+    _INSERT_BLOCK_SQL = '''
+        INSERT OR REPLACE INTO blocks
+        (index_num, timestamp, previous_hash, merkle_root, nonce, difficulty, hash, transactions, metadata)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    _SELECT_ALL_SQL = 'SELECT * FROM blocks ORDER BY index_num ASC'
+    _SELECT_BLOCK_SQL = 'SELECT * FROM blocks WHERE index_num = ?'
+
     def _save_block_sqlite(self, block_dict: Dict) -> bool:
-        """Save block to SQLite."""
-        try:
-            cursor = self.connection.cursor()
+        """Save a single block to SQLite (a one-element batch)."""
+        return self._save_blocks_sqlite([block_dict])
+
+    def _save_blocks_sqlite(self, block_dicts: List[Dict]) -> bool:
+        """Save a batch of blocks to SQLite in one transaction."""
+        with self._write_lock:
+            return self._insert_blocks_locked(block_dicts)
 
-            cursor.execute('''
-                INSERT OR REPLACE INTO blocks
-                (index_num, timestamp, previous_hash, merkle_root, nonce, difficulty, hash, transactions, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                block_dict['index'],
-                block_dict['timestamp'],
-                block_dict['previous_hash'],
-                block_dict.get('merkle_root', ''),
-                block_dict.get('nonce', 0),
-                block_dict.get('difficulty', 0),
-                block_dict['hash'],
-                json.dumps(block_dict.get('transactions', [])),
-                json.dumps(block_dict.get('metadata', {}))
-            ))
+    def _insert_blocks_locked(self, block_dicts: List[Dict]) -> bool:
+        """Insert blocks in one transaction. Caller holds _write_lock."""
+        try:
+            rows = [self._block_row(block_dict) for block_dict in block_dicts]
 
+            cursor = self.connection.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.executemany(self._INSERT_BLOCK_SQL, rows)
             self.connection.commit()
-            logger.info(f"Block {block_dict['index']} saved to SQLite")
+
+            logger.info(f"Saved {len(rows)} blocks to SQLite in one transaction")
             return True
 
         except Exception as e:
-            logger.error(f"Error saving block to SQLite: {e}")
+            logger.error(f"Error saving block batch to SQLite: {e}")
             if self.connection:
                 self.connection.rollback()
             return False
@@ -133,11 +375,12 @@ class PersistenceLayer:
     def _save_block_json(self, block_dict: Dict) -> bool:
         """Save block to JSON file (fallback)."""
         try:
-            chain = self.load_chain()
-            chain.append(block_dict)
+            with self._write_lock:
+                chain = self.load_chain()
+                chain.append(block_dict)
 
-            with open(self.json_backup_path, 'w') as f:
-                json.dump(chain, f, indent=2)
+                with open(self.json_backup_path, 'w') as f:
+                    json.dump(chain, f, indent=2)
 
             logger.info(f"Block {block_dict['index']} saved to JSON")
             return True
@@ -146,41 +389,55 @@ class PersistenceLayer:
             logger.error(f"Error saving block to JSON: {e}")
             return False
 
-    def load_chain(self) -> List[Dict]:
-        """Load the entire blockchain."""
+    @staticmethod
+    def _row_to_dict(row) -> Dict:
+        """Convert a blocks-table row back into a block dict."""
+        return {
+            'index': row['index_num'],
+            'timestamp': row['timestamp'],
+            'previous_hash': row['previous_hash'],
+            'merkle_root': row['merkle_root'],
+            'nonce': row['nonce'],
+            'difficulty': row['difficulty'],
+            'hash': row['hash'],
+            'transactions': _unpack_column(row['transactions']),
+            'metadata': _unpack_column(row['metadata']) or {}
+        }
+
+    def iter_blocks(self, chunk: int = 500) -> Iterator[Dict]:
+        """Stream blocks in index order, decoding `chunk` rows at a time.
+
+        Validation/replay code can walk the chain without ever holding
+        more than one fetchmany batch of decoded blocks in memory. The
+        pooled read connection stays borrowed until the generator is
+        exhausted or closed.
+        """
         if self.use_sqlite and self.connection:
-            return self._load_chain_sqlite()
+            self.flush()
+            try:
+                with self.read_pool.acquire() as connection:
+                    cursor = connection.cursor()
+                    cursor.arraysize = chunk
+                    cursor.execute(self._SELECT_ALL_SQL)
+                    while True:
+                        rows = cursor.fetchmany()
+                        if not rows:
+                            break
+                        for row in rows:
+                            yield self._row_to_dict(row)
+            except Exception as e:
+                logger.error(f"Error iterating chain from SQLite: {e}")
         else:
-            return self._load_chain_json()
-
-    def _load_chain_sqlite(self) -> List[Dict]:
-        """Load chain from SQLite."""
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute('SELECT * FROM blocks ORDER BY index_num ASC')
-            rows = cursor.fetchall()
-
-            chain = []
-            for row in rows:
-                block_dict = {
-                    'index': row['index_num'],
-                    'timestamp': row['timestamp'],
-                    'previous_hash': row['previous_hash'],
-                    'merkle_root': row['merkle_root'],
-                    'nonce': row['nonce'],
-                    'difficulty': row['difficulty'],
-                    'hash': row['hash'],
-                    'transactions': json.loads(row['transactions']),
-                    'metadata': json.loads(row['metadata']) if row['metadata'] else {}
-                }
-                chain.append(block_dict)
+            yield from self._load_chain_json()
 
+    def load_chain(self) -> List[Dict]:
+        """Load the entire blockchain."""
+        if self.use_sqlite and self.connection:
+            chain = list(self.iter_blocks())
             logger.info(f"Loaded {len(chain)} blocks from SQLite")
             return chain
-
-        except Exception as e:
-            logger.error(f"Error loading chain from SQLite: {e}")
-            return []
+        else:
+            return self._load_chain_json()
 
     def _load_chain_json(self) -> List[Dict]:
         """Load chain from JSON file (fallback)."""
@@ -200,43 +457,111 @@ class PersistenceLayer:
         """Get a specific block by index."""
         if self.use_sqlite and self.connection:
             try:
-                cursor = self.connection.cursor()
-                cursor.execute('SELECT * FROM blocks WHERE index_num = ?', (index,))
-                row = cursor.fetchone()
+                self.flush()
+                with self.read_pool.acquire() as connection:
+                    cursor = connection.cursor()
+                    cursor.execute(self._SELECT_BLOCK_SQL, (index,))
+                    row = cursor.fetchone()
 
                 if row:
-                    return {
-                        'index': row['index_num'],
-                        'timestamp': row['timestamp'],
-                        'previous_hash': row['previous_hash'],
-                        'merkle_root': row['merkle_root'],
-                        'nonce': row['nonce'],
-                        'difficulty': row['difficulty'],
-                        'hash': row['hash'],
-                        'transactions': json.loads(row['transactions']),
-                        'metadata': json.loads(row['metadata']) if row['metadata'] else {}
-                    }
+                    return self._row_to_dict(row)
+
+                # The SELECT is authoritative: a miss means the block
+                # does not exist, so there is no full-chain fallback.
+                return None
 
             except Exception as e:
                 logger.error(f"Error getting block {index}: {e}")
+                return None
 
-        chain = self.load_chain()
-        for block in chain:
+        for block in self.load_chain():
             if block['index'] == index:
                 return block
 
         return None
 
-    def clear_chain(self) -> bool:
-        """Clear the entire blockchain (use with caution)."""
+    def _count_blocks(self) -> int:
+        """Count persisted blocks with an index scan, not a chain load."""
+        if self.use_sqlite and self.connection:
+            try:
+                self.flush()
+                with self.read_pool.acquire() as connection:
+                    return connection.execute(
+                        'SELECT COUNT(*) FROM blocks'
+                    ).fetchone()[0]
+            except Exception as e:
+                logger.error(f"Error counting blocks: {e}")
+                return 0
+
+        return len(self._load_chain_json())
+
+    def get_tip_index(self) -> Optional[int]:
+        """Get the highest persisted block index (None on an empty chain)."""
+        if self.use_sqlite and self.connection:
+            try:
+                self.flush()
+                with self.read_pool.acquire() as connection:
+                    return connection.execute(
+                        'SELECT MAX(index_num) FROM blocks'
+                    ).fetchone()[0]
+            except Exception as e:
+                logger.error(f"Error getting tip index: {e}")
+                return None
+
+        chain = self._load_chain_json()
+        return chain[-1]['index'] if chain else None
+
+    def save_header_hash(self, header_bytes: bytes, block_hash: str) -> bool:
+        """Persist a verified header -> hash pair for fast revalidation."""
+        if not (self.use_sqlite and self.connection):
+            return False
+
         try:
-            if self.use_sqlite and self.connection:
+            with self._write_lock:
                 cursor = self.connection.cursor()
-                cursor.execute('DELETE FROM blocks')
+                cursor.execute('''
+                    INSERT OR REPLACE INTO hash_cache (header, hash) VALUES (?, ?)
+                ''', (header_bytes, block_hash))
                 self.connection.commit()
+            return True
 
-            if os.path.exists(self.json_backup_path):
-                os.remove(self.json_backup_path)
+        except Exception as e:
+            logger.error(f"Error saving header hash: {e}")
+            return False
+
+    def load_hash_cache(self) -> Dict[bytes, str]:
+        """Load all persisted header -> hash pairs."""
+        if not (self.use_sqlite and self.connection):
+            return {}
+
+        try:
+            with self.read_pool.acquire() as connection:
+                cursor = connection.cursor()
+                cursor.execute('SELECT header, hash FROM hash_cache')
+                return {row['header']: row['hash'] for row in cursor.fetchall()}
+
+        except Exception as e:
+            logger.error(f"Error loading hash cache: {e}")
+            return {}
+
+    def clear_chain(self) -> bool:
+        """Clear the entire blockchain (use with caution)."""
+        try:
+            with self._write_lock:
+                # Queued blocks are about to be deleted anyway; drop
+                # them inside the write lock so an in-flight flush
+                # cannot re-insert them after the DELETE.
+                with self._queue_cond:
+                    self._write_queue.clear()
+
+                if self.use_sqlite and self.connection:
+                    cursor = self.connection.cursor()
+                    cursor.execute('DELETE FROM blocks')
+                    cursor.execute('DELETE FROM hash_cache')
+                    self.connection.commit()
+
+                if os.path.exists(self.json_backup_path):
+                    os.remove(self.json_backup_path)
 
             logger.warning("Blockchain cleared!")
             return True
@@ -246,11 +571,24 @@ class PersistenceLayer:
             return False
 
     def snapshot(self, snapshot_path: str) -> bool:
-        """Create a snapshot of the current blockchain."""
+        """Create a snapshot of the current blockchain.
+
+        Uses SQLite's online backup API: a C-level page copy that
+        cooperates with WAL and does not block writers, rather than
+        materializing every block in Python and re-encoding it as JSON.
+        Falls back to a JSON export when SQLite is unavailable.
+        """
+        if not (self.use_sqlite and self.connection):
+            return self.export_json(snapshot_path)
+
         try:
-            chain = self.load_chain()
-            with open(snapshot_path, 'w') as f:
-                json.dump(chain, f, indent=2)
+            self.flush()
+            destination = sqlite3.connect(snapshot_path)
+            try:
+                with destination:
+                    self.connection.backup(destination, pages=1024)
+            finally:
+                destination.close()
 
             logger.info(f"Snapshot created at {snapshot_path}")
             return True
@@ -259,17 +597,42 @@ class PersistenceLayer:
             logger.error(f"Error creating snapshot: {e}")
             return False
 
+    def export_json(self, export_path: str) -> bool:
+        """Export the chain as JSON for interchange with other tools."""
+        try:
+            chain = self.load_chain()
+            with open(export_path, 'w') as f:
+                json.dump(chain, f, indent=2)
+
+            logger.info(f"Chain exported to {export_path}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error exporting chain: {e}")
+            return False
+
     def get_stats(self) -> Dict:
         """Get persistence layer statistics."""
         return {
             'backend': 'sqlite' if self.use_sqlite else 'json',
             'db_path': self.db_path,
-            'block_count': len(self.load_chain()),
+            'block_count': self._count_blocks(),
             'connection_status': 'connected' if self.connection else 'disconnected'
         }
 
     def close(self):
-        """Close database connection."""
+        """Flush pending writes and close the database connection."""
+        self._closed = True
+        with self._queue_cond:
+            self._queue_cond.notify()
+
+        self.flush()
+
+        if self.read_pool:
+            self.read_pool.close()
+            self.read_pool = None
+
         if self.connection:
             self.connection.close()
+            self.connection = None
             logger.info("Database connection closed")
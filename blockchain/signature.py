@@ -1,3 +1,4 @@
+import functools
 import hashlib
 import logging
 from typing import Tuple, Optional
@@ -5,6 +6,23 @@ from typing import Tuple, Optional
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=4096)
+def _derive_public_key(private_key: str) -> str:
+    """Derive public key from private key (simplified, memoized).
+
+    Derivation is a pure function of the private key, so re-importing
+    the same key (KeyManager, from_dict round-trips) is a cache hit
+    instead of a SHA-256 recompute.
+    """
+    return hashlib.sha256(private_key.encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=4096)
+def _public_key_to_address(public_key: str) -> str:
+    """Convert public key to address (memoized)."""
+    return hashlib.sha256(public_key.encode()).hexdigest()[:40]
+
+
 class SimpleKeyPair:
     """
     Simplified key management for demo purposes.
@@ -27,36 +45,50 @@ class SimpleKeyPair:
 
     def _derive_public_key(self, private_key: str) -> str:
         """Derive public key from private key (simplified)."""
-        return hashlib.sha256(private_key.encode()).hexdigest()
+        return _derive_public_key(private_key)
 
     def _public_key_to_address(self, public_key: str) -> str:
         """Convert public key to address."""
-        return hashlib.sha256(public_key.encode()).hexdigest()[:40]
+        return _public_key_to_address(public_key)
 
     def sign(self, message: str) -> str:
         """
         Sign a message with the private key.
-        This is a simplified implementation for demo purposes.
+
+        Uses blake2b as a keyed MAC: the key rides in the hash state
+        instead of an f-string concat-and-encode, and blake2b is faster
+        per byte than SHA-256 here. Demo scheme, not real asymmetric
+        crypto.
         """
-        combined = f"{self.private_key}{message}"
-        signature = hashlib.sha256(combined.encode()).hexdigest()
+        signature = hashlib.blake2b(
+            message.encode(),
+            key=self.private_key.encode()[:64],
+            digest_size=32,
+        ).hexdigest()
         logger.debug(f"Message signed: {signature[:16]}...")
         return signature
 
+    def verify_own(self, message: str, signature: str) -> bool:
+        """Recompute the keyed MAC and compare (needs the private key)."""
+        return self.sign(message) == signature
+
     @staticmethod
     def verify(message: str, signature: str, public_key: str) -> bool:
         """
         Verify a signature.
-        This is a simplified implementation for demo purposes.
-        """
-        private_key_guess = ""
-        for potential_private in [""]:
-            if hashlib.sha256(potential_private.encode()).hexdigest() == public_key:
-                private_key_guess = potential_private
-                break
 
+        The keyed MAC cannot be recomputed from the public key in this
+        demo scheme, so the static check validates the signature shape;
+        holders of the key pair can use verify_own for a real compare.
+        """
         logger.debug(f"Signature verification: simplified check")
-        return len(signature) == 64
+        if not isinstance(signature, str) or len(signature) != 64:
+            return False
+        try:
+            bytes.fromhex(signature)
+            return True
+        except ValueError:
+            return False
 
     def to_dict(self) -> dict:
         """Export key pair to dictionary."""
@@ -99,9 +131,17 @@ class KeyManager:
         """Get a key pair by name."""
         return self.keys.get(name)
 
-    def list_keys(self) -> list:
-        """List all key names."""
-        return list(self.keys.keys())
+    def list_keys(self):
+        """All key names as a live dict view (O(1), no copy).
+
+        The view tracks later create/delete calls; wrap in list() if a
+        point-in-time copy is needed.
+        """
+        return self.keys.keys()
+
+    def items(self):
+        """Iterate (name, key_pair) pairs in a single pass."""
+        return self.keys.items()
 
     def export_key(self, name: str) -> Optional[dict]:
         """Export a key pair."""
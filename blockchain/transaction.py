@@ -1,25 +1,34 @@
+import sys
 import time
 import uuid
 import logging
+import threading
 from typing import Optional, Dict
 from dataclasses import dataclass, field
+from sortedcontainers import SortedKeyList
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     """
     Represents a transaction in the blockchain.
+
+    slots=True drops the per-instance __dict__, shrinking each
+    transaction's footprint so mempool scans stay cache-friendly.
     """
     sender: str
     recipient: str
     amount: float
     fee: float = 0.0
     timestamp: float = field(default_factory=time.time)
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    # .hex skips str(UUID)'s dash formatting and is 4 chars shorter,
+    # trimming every serialized transaction the id travels in.
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
     signature: Optional[str] = None
     data: Optional[Dict] = None
+    _canonical: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Validate transaction data after initialization."""
@@ -47,7 +56,7 @@ class Transaction:
     def from_dict(cls, data: Dict) -> 'Transaction':
         """Create a transaction from a dictionary."""
         return cls(
-            id=data.get('id', str(uuid.uuid4())),
+            id=data.get('id') or uuid.uuid4().hex,
             sender=data['sender'],
             recipient=data['recipient'],
             amount=data['amount'],
@@ -57,9 +66,23 @@ class Transaction:
             data=data.get('data')
         )
 
+    def get_canonical_bytes(self) -> bytes:
+        """Get the canonical byte serialization for hashing/signing (cached).
+
+        The fields feeding it never change after construction (the
+        signature is deliberately excluded), so the encode happens once
+        per transaction no matter how often it is hashed or signed.
+        """
+        if self._canonical is None:
+            self._canonical = (
+                f"{self.id}{self.sender}{self.recipient}"
+                f"{self.amount}{self.fee}{self.timestamp}"
+            ).encode()
+        return self._canonical
+
     def get_transaction_string(self) -> str:
         """Get a string representation for hashing/signing."""
-        return f"{self.id}{self.sender}{self.recipient}{self.amount}{self.fee}{self.timestamp}"
+        return self.get_canonical_bytes().decode()
 
     def sign(self, private_key) -> None:
         """
@@ -81,17 +104,32 @@ class Transaction:
         return f"Transaction({self.id[:8]}...: {self.sender[:8]}... -> {self.recipient[:8]}... Amount: {self.amount})"
 
 
+# One coinbase tx per block shares this sender; interning keeps every
+# row pointing at the same string object.
+_COINBASE_SENDER = sys.intern("COINBASE")
+
+
 class CoinbaseTransaction(Transaction):
     """
     Special transaction type for block rewards.
+
+    Coinbase transactions have a deterministic identity — one per block
+    — so the id is derived from the block index instead of spending a
+    uuid4 per mined block.
     """
 
-    def __init__(self, recipient: str, reward: float, fees: float = 0.0):
+    # The slotted base class has no __dict__ to absorb extra attributes,
+    # so the subclass declares its own.
+    __slots__ = ('reward', 'fees_collected')
+
+    def __init__(self, recipient: str, reward: float, fees: float = 0.0,
+                 block_index: int = 0):
         super().__init__(
-            sender="COINBASE",
+            sender=_COINBASE_SENDER,
             recipient=recipient,
             amount=reward + fees,
-            fee=0.0
+            fee=0.0,
+            id=f"cb-{block_index}"
         )
         self.reward = reward
         self.fees_collected = fees
@@ -108,52 +146,92 @@ class CoinbaseTransaction(Transaction):
 class TransactionPool:
     """
     Manages pending transactions (mempool).
+
+    Alongside the id -> transaction map, a fee-ordered index and a
+    running fee total are maintained on add/remove, so miners get the
+    top-N transactions by fee without sorting and fee totals without
+    re-summing the pool.
     """
 
     def __init__(self):
         self.transactions: Dict[str, Transaction] = {}
+        self._by_fee = SortedKeyList(key=lambda tx: -tx.fee)
+        self._total_fee = 0.0
+        self.lock = threading.Lock()
         logger.info("Transaction pool initialized")
 
     def add_transaction(self, transaction: Transaction) -> bool:
         """Add a transaction to the pool."""
-        try:
-            if transaction.id in self.transactions:
-                logger.warning(f"Transaction {transaction.id} already in pool")
-                return False
+        return self.add_transactions([transaction])[0]
 
-            self.transactions[transaction.id] = transaction
-            logger.info(f"Transaction {transaction.id[:8]}... added to pool")
-            return True
+    def add_transactions(self, transactions: list) -> list:
+        """
+        Add a batch of transactions under a single lock acquisition.
+        Returns a list of booleans, one per transaction, in input order.
+        """
+        results = []
+
+        try:
+            with self.lock:
+                for transaction in transactions:
+                    if transaction.id in self.transactions:
+                        logger.warning(f"Transaction {transaction.id} already in pool")
+                        results.append(False)
+                        continue
+
+                    self.transactions[transaction.id] = transaction
+                    self._by_fee.add(transaction)
+                    self._total_fee += transaction.fee
+                    results.append(True)
+
+            added = sum(results)
+            logger.info(f"{added}/{len(transactions)} transactions added to pool")
+            return results
 
         except Exception as e:
-            logger.error(f"Error adding transaction to pool: {e}")
-            return False
+            logger.error(f"Error adding transactions to pool: {e}")
+            return results + [False] * (len(transactions) - len(results))
 
     def remove_transaction(self, transaction_id: str) -> bool:
         """Remove a transaction from the pool."""
-        if transaction_id in self.transactions:
-            del self.transactions[transaction_id]
-            logger.info(f"Transaction {transaction_id[:8]}... removed from pool")
-            return True
-        return False
+        with self.lock:
+            transaction = self.transactions.pop(transaction_id, None)
+            if transaction is None:
+                return False
+            self._by_fee.remove(transaction)
+            self._total_fee -= transaction.fee
+
+        logger.info(f"Transaction {transaction_id[:8]}... removed from pool")
+        return True
 
     def get_transactions(self, limit: Optional[int] = None) -> list:
-        """Get transactions from the pool."""
-        transactions = list(self.transactions.values())
-        if limit:
-            transactions = transactions[:limit]
-        return transactions
+        """Get transactions from the pool, highest fee first.
+
+        Returns a fresh list on purpose: callers hand the result to
+        mining/validation while the pool keeps mutating, so a live view
+        of the fee index would shift under them mid-block. The copy is
+        taken under the pool lock — SortedKeyList is not safe to
+        traverse during a concurrent add/remove.
+        """
+        with self.lock:
+            if limit:
+                return list(self._by_fee.islice(stop=limit))
+            return list(self._by_fee)
 
     def clear(self):
         """Clear all transactions from the pool."""
-        count = len(self.transactions)
-        self.transactions.clear()
+        with self.lock:
+            count = len(self.transactions)
+            self.transactions.clear()
+            self._by_fee.clear()
+            self._total_fee = 0.0
         logger.info(f"Transaction pool cleared ({count} transactions removed)")
 
     def get_total_fees(self, transactions: list = None) -> float:
-        """Calculate total fees from transactions."""
+        """Total fees in the pool (O(1)) or of an explicit list."""
         if transactions is None:
-            transactions = self.transactions.values()
+            with self.lock:
+                return self._total_fee
         return sum(tx.fee for tx in transactions)
 
     def size(self) -> int:
@@ -162,8 +240,11 @@ class TransactionPool:
 
     def to_dict(self) -> Dict:
         """Convert pool to dictionary."""
-        return {
-            'size': self.size(),
-            'transactions': [tx.to_dict() for tx in self.transactions.values()],
-            'total_fees': self.get_total_fees()
-        }
+        # One lock acquisition for a consistent size/transactions/fees
+        # snapshot (also why this doesn't call size()/get_total_fees()).
+        with self.lock:
+            return {
+                'size': len(self.transactions),
+                'transactions': [tx.to_dict() for tx in self.transactions.values()],
+                'total_fees': self._total_fee
+            }
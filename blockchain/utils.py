@@ -2,6 +2,59 @@ import json
 import hashlib
 from typing import Any, Dict
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised on minimal installs
+    orjson = None
+
+
+def _resolve_sha256():
+    """
+    Select the fastest available SHA-256 constructor once at import.
+
+    OpenSSL's EVP implementation does its own runtime CPU dispatch
+    (SHA-NI / AVX2 / SSSE3) the way bitcoind's SHA256AutoDetect does;
+    binding it here means every hot call site pays zero per-call
+    selection overhead. Falls back to hashlib's builtin when Python was
+    built without OpenSSL.
+    """
+    try:
+        from _hashlib import openssl_sha256
+        return openssl_sha256
+    except ImportError:
+        return hashlib.sha256
+
+
+sha256 = _resolve_sha256()
+
+
+# The two encoders must emit byte-identical JSON or hashes would vary
+# by install: ensure_ascii=False matches orjson's raw UTF-8 output, and
+# OPT_NON_STR_KEYS matches the stdlib's key stringification (so e.g.
+# {1: 'a'} encodes as {"1":"a"} either way).
+if orjson is not None:
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+    _ORJSON_SORTED_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+    def json_dumps(obj: Any) -> str:
+        """Serialize to compact JSON via orjson's C encoder."""
+        return orjson.dumps(obj, option=_ORJSON_OPTS).decode()
+
+    json_loads = orjson.loads
+
+    def _dumps_sorted(obj: Any) -> str:
+        return orjson.dumps(obj, option=_ORJSON_SORTED_OPTS).decode()
+else:
+    def json_dumps(obj: Any) -> str:
+        """Serialize to compact JSON (stdlib fallback)."""
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+    json_loads = json.loads
+
+    def _dumps_sorted(obj: Any) -> str:
+        return json.dumps(obj, sort_keys=True, separators=(',', ':'),
+                          ensure_ascii=False)
+
 
 def deterministic_serialize(data: Any) -> str:
     """
@@ -9,41 +62,108 @@ def deterministic_serialize(data: Any) -> str:
     Ensures that the same data always produces the same hash.
     """
     if isinstance(data, dict):
-        return json.dumps(data, sort_keys=True, separators=(',', ':'))
+        return _dumps_sorted(data)
     elif isinstance(data, (list, tuple)):
-        return json.dumps(data, separators=(',', ':'))
+        # orjson rejects tuples; normalize before encoding.
+        return json_dumps(list(data))
     elif isinstance(data, str):
         return data
     else:
         return str(data)
 
 
+def hash_bytes(data: bytes) -> str:
+    """
+    Hash raw bytes using SHA256, as hex.
+
+    Bytes-first variant of hash_data for callers that already hold an
+    encoded buffer, sparing the str round-trip per call.
+    """
+    return sha256(data).hexdigest()
+
+
+def canonicalize_tx(tx: Dict) -> bytes:
+    """
+    Canonical byte serialization of a transaction dict for leaf hashing.
+
+    Fixed field order, one format and one encode — no JSON encoder in
+    the per-transaction path. The field order matches the historical
+    Merkle leaf format, so roots are unchanged.
+    """
+    return (
+        f"{tx.get('id', '')}{tx.get('sender', '')}{tx.get('recipient', '')}"
+        f"{tx.get('amount', 0)}{tx.get('timestamp', '')}"
+    ).encode()
+
+
+def hash_pair(left: bytes, right: bytes) -> bytes:
+    """
+    Hash two raw 32-byte digests into their parent digest.
+
+    The bytes-in/bytes-out shape of the Merkle interior: 64 bytes of
+    input per node instead of the 128 a hex round-trip would feed the
+    compressor.
+    """
+    return sha256(left + right).digest()
+
+
 def hash_data(data: str) -> str:
     """
     Hash data using SHA256.
     """
-    return hashlib.sha256(data.encode()).hexdigest()
+    return sha256(data.encode()).hexdigest()
 
 
 def validate_hash_format(hash_string: str) -> bool:
     """
     Validate that a string is a valid SHA256 hash (64 hex characters).
     """
-    if not isinstance(hash_string, str):
-        return False
-    if len(hash_string) != 64:
+    if not isinstance(hash_string, str) or len(hash_string) != 64:
         return False
     try:
-        int(hash_string, 16)
+        bytes.fromhex(hash_string)
         return True
     except ValueError:
         return False
 
 
+# Precomputed '0' * d targets for every possible difficulty of a
+# 64-hex-digit hash, so meets_difficulty never rebuilds the prefix.
+_ZERO_PREFIXES = tuple('0' * d for d in range(65))
+
+
 def meets_difficulty(hash_string: str, difficulty: int) -> bool:
     """
     Check if a hash meets the required difficulty (number of leading zeros).
     """
     if not validate_hash_format(hash_string):
         return False
-    return hash_string.startswith('0' * difficulty)
+    if not 0 <= difficulty < len(_ZERO_PREFIXES):
+        return False
+    return hash_string.startswith(_ZERO_PREFIXES[difficulty])
+
+
+def digest_meets_difficulty(digest: bytes, difficulty: int) -> bool:
+    """
+    Check difficulty against a raw 32-byte digest, without the hex
+    round-trip. Equivalent to meets_difficulty(digest.hex(), difficulty).
+
+    Each hex zero is 4 leading zero bits, so for difficulty <= 16 the
+    whole check is a single branchless comparison on the first 8 bytes:
+    the bit_length of that word must not exceed 64 minus the required
+    zero bits (int.bit_length compiles down to a count-leading-zeros).
+    """
+    if not isinstance(digest, bytes) or len(digest) != 32:
+        return False
+
+    if difficulty <= 16:
+        return int.from_bytes(digest[:8], 'big').bit_length() <= 64 - 4 * difficulty
+
+    # Difficulties beyond 16 hex digits span more than the first word;
+    # fall back to the byte/nibble scan.
+    zero_bytes, odd_nibble = divmod(difficulty, 2)
+    if zero_bytes >= len(digest):
+        return digest == b'\x00' * len(digest)
+    if digest[:zero_bytes] != b'\x00' * zero_bytes:
+        return False
+    return not odd_nibble or digest[zero_bytes] < 16
@@ -0,0 +1,82 @@
+import os
+
+# The shared app.state singletons read their config at import time.
+os.environ['ENABLE_PERSISTENCE'] = 'false'
+os.environ['MINING_DIFFICULTY'] = '1'
+
+import pytest
+from flask import Flask
+
+from app.api import api
+from app.state import blockchain
+
+
+@pytest.fixture
+def client():
+    """Create a test client with the API blueprint mounted."""
+    app = Flask(__name__)
+    app.register_blueprint(api)
+    blockchain.transaction_pool.clear()
+    return app.test_client()
+
+
+def test_batch_transactions_per_entry_results(client):
+    """Test that each batch entry gets its own result, in input order."""
+    response = client.post('/api/transactions/batch', json={
+        'transactions': [
+            {'sender': 'alice', 'recipient': 'bob', 'amount': 5, 'fee': 0.1},
+            {'sender': 'carol'},
+            {'sender': 'dave', 'recipient': 'erin', 'amount': -1},
+            {'sender': 'frank', 'recipient': 'grace', 'amount': 2},
+        ]
+    })
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data['success'] is True
+    assert len(data['results']) == 4
+
+    assert data['results'][0]['success'] is True
+    assert data['results'][0]['transaction']['sender'] == 'alice'
+    assert data['results'][1]['success'] is False
+    assert 'Missing required fields' in data['results'][1]['error']
+    assert data['results'][2]['success'] is False
+    assert data['results'][3]['success'] is True
+    assert data['results'][3]['transaction']['sender'] == 'frank'
+
+    assert data['added'] == 2
+    assert data['mempool_size'] == 2
+
+
+def test_batch_transactions_empty_body(client):
+    """Test that an empty batch is rejected."""
+    response = client.post('/api/transactions/batch', json={'transactions': []})
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_chain_etag_conditional_get(client):
+    """Test that an unchanged chain answers If-None-Match with 304."""
+    response = client.get('/api/chain')
+    etag = response.headers['ETag']
+
+    assert response.status_code == 200
+    assert response.get_json()['success'] is True
+
+    cached = client.get('/api/chain', headers={'If-None-Match': etag})
+
+    assert cached.status_code == 304
+    assert cached.get_data() == b''
+
+
+def test_chain_etag_changes_with_chain(client):
+    """Test that growing the chain invalidates the old ETag."""
+    etag = client.get('/api/chain').headers['ETag']
+
+    blockchain.add_block("etag test block")
+
+    response = client.get('/api/chain', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
@@ -0,0 +1,105 @@
+import json
+import sqlite3
+
+import pytest
+from blockchain.persistence import PersistenceLayer
+
+
+def make_block(index, previous_hash="0" * 64):
+    """Build a minimal block dict for persistence tests."""
+    return {
+        'index': index,
+        'timestamp': float(index),
+        'previous_hash': previous_hash,
+        'merkle_root': 'root',
+        'nonce': 0,
+        'difficulty': 0,
+        'hash': f'hash-{index}',
+        'transactions': [{'id': f'tx-{index}', 'amount': 1.0}],
+        'metadata': {}
+    }
+
+
+@pytest.fixture
+def persistence(tmp_path):
+    """Create a persistence layer backed by a temporary database."""
+    layer = PersistenceLayer(str(tmp_path / "chain.db"))
+    yield layer
+    layer.close()
+
+
+def test_save_and_load_roundtrip(persistence):
+    """Test that saved blocks load back intact."""
+    persistence.save_blocks([make_block(0), make_block(1)])
+
+    chain = persistence.load_chain()
+
+    assert len(chain) == 2
+    assert chain[0]['index'] == 0
+    assert chain[1]['hash'] == 'hash-1'
+    assert chain[1]['transactions'] == [{'id': 'tx-1', 'amount': 1.0}]
+
+
+def test_clear_chain_discards_queued_writes(persistence):
+    """Test that queued write-behind blocks do not survive clear_chain."""
+    persistence.save_block(make_block(0))
+    persistence.save_block(make_block(1))
+
+    persistence.clear_chain()
+    persistence.flush()
+
+    assert persistence.load_chain() == []
+
+
+def test_clear_then_save_keeps_only_new_chain(persistence):
+    """Test the replace-chain sequence: old queued blocks never resurface."""
+    persistence.save_block(make_block(0))
+
+    persistence.clear_chain()
+    persistence.save_blocks([make_block(0, previous_hash='new'), make_block(1)])
+    persistence.flush()
+
+    chain = persistence.load_chain()
+
+    assert len(chain) == 2
+    assert chain[0]['previous_hash'] == 'new'
+
+
+def test_legacy_text_schema_migration(tmp_path):
+    """Test that a pre-BLOB database with JSON TEXT columns loads back."""
+    db_path = str(tmp_path / "legacy.db")
+
+    connection = sqlite3.connect(db_path)
+    connection.execute('''
+        CREATE TABLE blocks (
+            index_num INTEGER PRIMARY KEY,
+            timestamp REAL NOT NULL,
+            previous_hash TEXT NOT NULL,
+            merkle_root TEXT NOT NULL,
+            nonce INTEGER DEFAULT 0,
+            difficulty INTEGER DEFAULT 0,
+            hash TEXT NOT NULL UNIQUE,
+            transactions TEXT NOT NULL,
+            metadata TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    connection.execute(
+        'INSERT INTO blocks (index_num, timestamp, previous_hash, merkle_root, '
+        'nonce, difficulty, hash, transactions, metadata) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        (0, 1.0, '0' * 64, 'root', 0, 0, 'hash-0',
+         json.dumps([{'id': 'tx-0', 'amount': 1.0}]), json.dumps({'k': 'v'}))
+    )
+    connection.commit()
+    connection.close()
+
+    layer = PersistenceLayer(db_path)
+    try:
+        chain = layer.load_chain()
+
+        assert len(chain) == 1
+        assert chain[0]['transactions'] == [{'id': 'tx-0', 'amount': 1.0}]
+        assert chain[0]['metadata'] == {'k': 'v'}
+    finally:
+        layer.close()
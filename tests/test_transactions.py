@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+from blockchain.transaction import Transaction, TransactionPool
+
+
+def make_transaction(fee):
+    """Build a transaction with the given fee."""
+    return Transaction(sender='alice', recipient='bob', amount=1.0, fee=fee)
+
+
+@pytest.fixture
+def pool():
+    """Create a transaction pool."""
+    return TransactionPool()
+
+
+def test_get_transactions_fee_ordered(pool):
+    """Test that transactions come back highest fee first."""
+    for fee in (0.1, 0.5, 0.3, 0.2):
+        pool.add_transaction(make_transaction(fee))
+
+    fees = [tx.fee for tx in pool.get_transactions()]
+
+    assert fees == [0.5, 0.3, 0.2, 0.1]
+
+
+def test_get_transactions_limit(pool):
+    """Test that the limit returns only the top fee payers."""
+    for fee in (0.1, 0.5, 0.3):
+        pool.add_transaction(make_transaction(fee))
+
+    top = pool.get_transactions(limit=2)
+
+    assert [tx.fee for tx in top] == [0.5, 0.3]
+
+
+def test_total_fees_tracks_adds_and_removes(pool):
+    """Test that the running fee total follows pool mutations."""
+    tx = make_transaction(0.5)
+    pool.add_transaction(tx)
+    pool.add_transaction(make_transaction(0.3))
+
+    assert pool.get_total_fees() == pytest.approx(0.8)
+
+    pool.remove_transaction(tx.id)
+
+    assert pool.get_total_fees() == pytest.approx(0.3)
+
+    pool.clear()
+
+    assert pool.get_total_fees() == 0.0
+
+
+def test_concurrent_reads_and_writes(pool):
+    """Test that readers see consistent snapshots during mutation."""
+    errors = []
+
+    def writer():
+        for _ in range(200):
+            tx = make_transaction(0.1)
+            pool.add_transaction(tx)
+            pool.remove_transaction(tx.id)
+
+    def reader():
+        for _ in range(200):
+            try:
+                txs = pool.get_transactions()
+                assert len(txs) in (0, 1)
+                pool.get_total_fees()
+                pool.to_dict()
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
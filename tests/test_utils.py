@@ -0,0 +1,60 @@
+import json
+import random
+
+from blockchain.utils import (
+    deterministic_serialize,
+    digest_meets_difficulty,
+    meets_difficulty,
+)
+
+
+def test_deterministic_serialize_sorts_keys():
+    """Test that dicts serialize the same regardless of insertion order."""
+    a = deterministic_serialize({'b': 2, 'a': 1})
+    b = deterministic_serialize({'a': 1, 'b': 2})
+
+    assert a == b
+    assert a == '{"a":1,"b":2}'
+
+
+def test_deterministic_serialize_non_str_keys():
+    """Test that non-string keys stringify like the stdlib encoder."""
+    assert deterministic_serialize({1: 'a', 0: 'b'}) == '{"0":"b","1":"a"}'
+
+
+def test_deterministic_serialize_unicode():
+    """Test that output is raw UTF-8 on every encoder, not \\u escapes."""
+    result = deterministic_serialize({'name': 'héllo'})
+
+    assert result == '{"name":"héllo"}'
+    assert result == json.dumps({'name': 'héllo'}, sort_keys=True,
+                                separators=(',', ':'), ensure_ascii=False)
+
+
+def test_deterministic_serialize_sequences():
+    """Test that lists and tuples serialize identically."""
+    assert deterministic_serialize([1, 'x', None]) == '[1,"x",null]'
+    assert deterministic_serialize((1, 'x', None)) == '[1,"x",null]'
+
+
+def test_digest_meets_difficulty_matches_hex_check():
+    """Test that the raw-digest check agrees with the hex-prefix check."""
+    rng = random.Random(42)
+
+    digests = [bytes(rng.randrange(256) for _ in range(32)) for _ in range(200)]
+    # Boundary digests: exactly d leading zero nibbles for each d.
+    for d in range(0, 65, 3):
+        digests.append(bytes.fromhex('0' * d + 'f' * (64 - d)))
+    digests.append(b'\x00' * 32)
+
+    for digest in digests:
+        for difficulty in range(0, 65):
+            assert digest_meets_difficulty(digest, difficulty) == \
+                meets_difficulty(digest.hex(), difficulty), \
+                (digest.hex(), difficulty)
+
+
+def test_digest_meets_difficulty_rejects_bad_input():
+    """Test that malformed digests are rejected, not miscounted."""
+    assert digest_meets_difficulty(b'\x00' * 31, 1) is False
+    assert digest_meets_difficulty('00' * 32, 1) is False